@@ -0,0 +1,61 @@
+"""
+Check that importing chembl_query stays within its cold-start budget.
+
+Each run imports the module in a fresh interpreter, so nothing is cached
+between measurements. Fails if the median import time exceeds the budget or
+if a heavy embedding dependency is imported eagerly.
+
+Usage: python bench-import.py [budget_seconds] [runs]
+"""
+import json
+import statistics
+import subprocess
+import sys
+
+MODULE = "chembl_query"
+DEFAULT_BUDGET = 1.5
+HEAVY_MODULES = ["torch", "sentence_transformers", "transformers", "onnxruntime"]
+
+PROBE = f"""
+import json, sys, time
+start = time.perf_counter()
+import {MODULE}
+elapsed = time.perf_counter() - start
+print(json.dumps({{
+    "seconds": elapsed,
+    "loaded": [m for m in {HEAVY_MODULES!r} if m in sys.modules],
+}}))
+"""
+
+def measure():
+    """Import the module once in a fresh interpreter."""
+    output = subprocess.run(
+        [sys.executable, "-c", PROBE],
+        check=True,
+        capture_output=True,
+        text=True
+    ).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+def main():
+    budget = float(sys.argv[1]) if len(sys.argv) > 1 else DEFAULT_BUDGET
+    runs = int(sys.argv[2]) if len(sys.argv) > 2 else 5
+
+    results = [measure() for _ in range(runs)]
+    median = statistics.median(r["seconds"] for r in results)
+    loaded = sorted({m for r in results for m in r["loaded"]})
+
+    print(f"import {MODULE}: median {median:.3f}s over {runs} runs (budget {budget:.3f}s)")
+    failed = False
+    if loaded:
+        print(f"FAIL: heavy modules imported eagerly: {', '.join(loaded)}")
+        failed = True
+    if median > budget:
+        print("FAIL: import time over budget")
+        failed = True
+    if not failed:
+        print("OK")
+    sys.exit(1 if failed else 0)
+
+if __name__ == "__main__":
+    main()
@@ -1,25 +1,148 @@
 import weaviate
+from weaviate.classes.config import Configure, DataType, Property, Tokenization, VectorDistances
+from weaviate.classes.query import Filter
 from weaviate.util import generate_uuid5
-from chembl_webresource_client.new_client import new_client
+from chembl_webresource_client.settings import Settings
 import pandas as pd
 from tqdm import tqdm
 import numpy as np
-from sentence_transformers import SentenceTransformer
+import hashlib
+import itertools
+import json
 import logging
+import multiprocessing
+import os
+import queue
+import sqlite3
+import threading
 import time
+import uuid
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from collection_version import bump_version
+from embedding_cache import EmbeddingCache
+from embedders import (
+    DEFAULT_MODEL_NAME, backend_id, encode_chunk, get_embedder, init_embedding_worker,
+    prepare_backend
+)
 
 # Set up logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+MODEL_NAME = DEFAULT_MODEL_NAME
+
+CHEMBL_API_URL = "https://www.ebi.ac.uk/chembl/api/data"
+
+# ChEMBL molecule fields fetched and stored on each object:
+# (field name, Weaviate data type, value used when the field is missing)
+COMPOUND_FIELDS = [
+    ("molecule_chembl_id", "TEXT", ""),
+    ("pref_name", "TEXT", ""),
+    ("molecule_type", "TEXT", ""),
+    ("max_phase", "NUMBER", 0),
+    ("therapeutic_flag", "BOOL", False),
+    ("structure_type", "TEXT", ""),
+]
+
+# Inverted index options for stored properties; unlisted properties use server defaults
+PROPERTY_INDEXES = {
+    # Exact-match lookup key
+    "molecule_chembl_id": {
+        "tokenization": Tokenization.FIELD,
+        "index_filterable": True,
+        "index_searchable": False,
+    },
+    # Filtered with GreaterThanEqual by phase queries
+    "max_phase": {"index_filterable": True, "index_range_filters": True},
+    # Only used for vectors and (optionally) keyword search
+    "description": {"index_filterable": False, "index_searchable": False},
+    # Only read back by object ID
+    "content_hash": {"index_filterable": False, "index_searchable": False},
+}
+
+# Quantizers available for vector index compression
+_QUANTIZERS = {
+    "pq": Configure.VectorIndex.Quantizer.pq,
+    "bq": Configure.VectorIndex.Quantizer.bq,
+    "sq": Configure.VectorIndex.Quantizer.sq,
+}
+
+# Result ordering for each source. Pages are fetched by offset, so the order
+# must be total: ties on max_phase are broken by a unique key.
+_API_ORDER = ("-max_phase", "molecule_chembl_id")
+_SQLITE_ORDER = "max_phase DESC, molregno"
+
+# molecule_dictionary columns whose names differ from the API field names
+_SQLITE_COLUMNS = {
+    "molecule_chembl_id": "chembl_id",
+}
+
+# Marks the end of a stream passed between pipeline stages
+_SENTINEL = object()
+
+class TokenBucket:
+    def __init__(self, rate, capacity=None):
+        """
+        Initialize a thread-safe token-bucket rate limiter.
+        
+        Args:
+            rate (float): Tokens added per second
+            capacity (float): Maximum burst size (defaults to one second of tokens)
+        """
+        self.rate = rate
+        self.capacity = capacity or max(1.0, rate)
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self, tokens=1):
+        """Block until the requested number of tokens is available."""
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            # Going into debt lets later callers queue up behind this one
+            self._tokens -= tokens
+            wait = -self._tokens / self.rate if self._tokens < 0 else 0
+        if wait > 0:
+            time.sleep(wait)
+
 class ChEMBLWeaviateImporter:
-    def __init__(self, weaviate_url="http://localhost:8080", batch_size=100):
+    def __init__(self, weaviate_url="http://localhost:8080", batch_size=100,
+                 encode_batch_size=64, embed_workers=0, worker_threads=1,
+                 cache_path=None, fetch_workers=4, requests_per_second=10.0,
+                 compound_fields=None, chembl_db_path=None, checkpoint_path=None,
+                 max_retries=3, retry_backoff=1.0, skip_unchanged=True,
+                 vector_index=None, searchable_description=False,
+                 embedding_backend="sentence-transformers"):
         """
         Initialize the ChEMBL to Weaviate importer.
         
         Args:
             weaviate_url (str): URL of the Weaviate instance
             batch_size (int): Number of records to process in each batch
+            encode_batch_size (int): Number of descriptions per model forward pass
+            embed_workers (int): Number of embedding worker processes (0 encodes in-process);
+                each worker task encodes encode_batch_size descriptions
+            worker_threads (int): Number of inference threads per embedding worker
+            cache_path (str): Path to an on-disk embedding cache (None disables caching)
+            fetch_workers (int): Number of ChEMBL pages fetched concurrently
+            requests_per_second (float): Rate limit for ChEMBL API requests (None disables it)
+            compound_fields (list): (name, data type, default) tuples for the ChEMBL fields
+                to fetch and store (defaults to COMPOUND_FIELDS)
+            chembl_db_path (str): Path to a local ChEMBL SQLite release to import from
+                instead of the web API
+            checkpoint_path (str): Path to a JSON checkpoint used to resume interrupted imports
+            max_retries (int): Number of times to retry objects rejected by Weaviate
+            retry_backoff (float): Delay in seconds before the first retry, doubled each time
+            skip_unchanged (bool): Only embed and write compounds whose content hash changed
+            vector_index (dict or str): Vector index profile used when creating the schema
+                (see create_schema)
+            searchable_description (bool): Build a keyword (BM25) index on description
+                when creating the schema
+            embedding_backend (str): Embedding backend: "sentence-transformers",
+                "onnx" or "onnx-int8"
         """
         self.client = weaviate.WeaviateClient(
             connection_params=weaviate.connect.ConnectionParams.from_url(
@@ -28,38 +151,232 @@ class ChEMBLWeaviateImporter:
             )
         )
         self.client.connect()
-        # Fix: Initialize new_client as a class instance
-        self.chembl_client = new_client
-        self.chembl_client.new_client_url = "https://www.ebi.ac.uk/chembl/api/data"
+        self._chembl_client = None
         self.batch_size = batch_size
-        self.model = SentenceTransformer('all-MiniLM-L6-v2')
-        
-    def create_schema(self):
-        """Create the Weaviate schema for ChEMBL compounds."""
-        properties = [
-            weaviate.Property(name="molecule_chembl_id", data_type=weaviate.DataType.TEXT),
-            weaviate.Property(name="pref_name", data_type=weaviate.DataType.TEXT),
-            weaviate.Property(name="molecule_type", data_type=weaviate.DataType.TEXT),
-            weaviate.Property(name="max_phase", data_type=weaviate.DataType.NUMBER),
-            weaviate.Property(name="therapeutic_flag", data_type=weaviate.DataType.BOOLEAN),
-            weaviate.Property(name="structure_type", data_type=weaviate.DataType.TEXT),
-            weaviate.Property(name="description", data_type=weaviate.DataType.TEXT),
+        self.encode_batch_size = encode_batch_size
+        self.embed_workers = embed_workers
+        self.worker_threads = worker_threads
+        self._pool = None
+        self.embedding_backend = embedding_backend
+        self.model = get_embedder(embedding_backend, MODEL_NAME) if not embed_workers else None
+        self.cache = (
+            EmbeddingCache(cache_path, backend_id(embedding_backend, MODEL_NAME))
+            if cache_path else None
+        )
+        self.fetch_workers = max(1, fetch_workers)
+        self.rate_limiter = TokenBucket(requests_per_second) if requests_per_second else None
+        self.compound_fields = list(compound_fields or COMPOUND_FIELDS)
+        if "molecule_chembl_id" not in [name for name, _, _ in self.compound_fields]:
+            raise ValueError("compound_fields must include molecule_chembl_id")
+        self.chembl_db_path = chembl_db_path
+        self.checkpoint_path = checkpoint_path
+        self.max_retries = max_retries
+        self.retry_backoff = retry_backoff
+        self.skip_unchanged = skip_unchanged
+        self.vector_index = vector_index
+        self.searchable_description = searchable_description
+        self.failed_objects = []
+
+    @property
+    def chembl_client(self):
+        """
+        The ChEMBL web API client, imported on first use.
+        
+        Importing chembl_webresource_client.new_client fetches the API
+        description from EBI, so imports from a local ChEMBL release never do.
+        """
+        if self._chembl_client is None:
+            from chembl_webresource_client.new_client import new_client
+            new_client.new_client_url = CHEMBL_API_URL
+            self._chembl_client = new_client
+        return self._chembl_client
+
+    def _get_pool(self):
+        """Start the embedding worker pool on first use and reuse it afterwards."""
+        if self._pool is None:
+            # Fetch (and quantize) model files once here rather than in every worker
+            prepare_backend(self.embedding_backend, MODEL_NAME)
+            ctx = multiprocessing.get_context("spawn")
+            self._pool = ctx.Pool(
+                processes=self.embed_workers,
+                initializer=init_embedding_worker,
+                initargs=(self.embedding_backend, MODEL_NAME, self.worker_threads)
+            )
+            logger.info(f"Started {self.embed_workers} embedding worker processes")
+        return self._pool
+
+    def close(self):
+        """Shut down the embedding worker pool and the Weaviate connection."""
+        if self._pool is not None:
+            self._pool.close()
+            self._pool.join()
+            self._pool = None
+        if self.cache is not None:
+            self.cache.close()
+        self.client.close()
+
+    def encode(self, descriptions):
+        """
+        Encode descriptions into embeddings, consulting the embedding cache first.
+        
+        Args:
+            descriptions (list): List of description strings
+        
+        Returns:
+            numpy.ndarray: float32 array with one row per description, in input order
+        """
+        return self._encode_async(descriptions)()
+
+    def _encode_async(self, descriptions):
+        """
+        Start encoding descriptions and return a function that waits for the result.
+        
+        With embed_workers the cache misses are queued on the worker pool right
+        away, so the caller can start on the next batch while they are encoded.
+        
+        Args:
+            descriptions (list): List of description strings
+        
+        Returns:
+            callable: Returns the float32 embeddings, one row per description, in input order
+        """
+        if self.cache is None:
+            return self._encode_uncached(descriptions)
+        
+        cached = self.cache.get_many(descriptions)
+        missing = [i for i, vector in enumerate(cached) if vector is None]
+        texts = [descriptions[i] for i in missing]
+        pending = self._encode_uncached(texts) if texts else None
+        logger.debug(f"Embedding cache: {len(descriptions) - len(missing)} hits, {len(missing)} misses")
+        
+        def wait():
+            if pending is not None:
+                vectors = pending()
+                self.cache.put_many(texts, vectors)
+                for i, vector in zip(missing, vectors):
+                    cached[i] = vector
+            return np.asarray(cached, dtype=np.float32)
+        return wait
+
+    def _encode_uncached(self, descriptions):
+        """
+        Start encoding descriptions with the in-process model or the worker pool.
+        
+        In-process encoding finishes before this returns. The worker pool gets
+        one task per encode_batch_size descriptions, so a large batch spreads
+        across workers.
+        
+        Returns:
+            callable: Returns the float32 embeddings in input order
+        """
+        if not self.embed_workers:
+            embeddings = self.model.encode(descriptions, batch_size=self.encode_batch_size)
+            return lambda: embeddings
+        
+        chunks = [
+            (descriptions[i:i + self.encode_batch_size], self.encode_batch_size)
+            for i in range(0, len(descriptions), self.encode_batch_size)
         ]
+        if not chunks:
+            return lambda: np.empty((0, 0), dtype=np.float32)
+        # map_async() preserves chunk order
+        result = self._get_pool().map_async(encode_chunk, chunks, chunksize=1)
+        return lambda: np.vstack(result.get())
+        
+    @staticmethod
+    def _vector_index_config(profile):
+        """
+        Build a Weaviate vector index configuration from a profile.
+        
+        Args:
+            profile (dict or str): Index profile, or just the index type as a string
+        
+        Returns:
+            Vector index configuration, or None for the server defaults
+        """
+        if profile is None:
+            return None
+        if isinstance(profile, str):
+            profile = {"type": profile}
+        options = dict(profile)
+        index_type = options.pop("type", "hnsw")
+        distance = VectorDistances(options.pop("distance", "cosine"))
+        compression = options.pop("compression", None)
+        compression_options = options.pop("compression_options", {})
+        
+        quantizer = None
+        if compression is not None:
+            if compression not in _QUANTIZERS:
+                raise ValueError(f"Unknown vector compression: {compression}")
+            quantizer = _QUANTIZERS[compression](**compression_options)
+        
+        if index_type == "flat":
+            if compression not in (None, "bq"):
+                raise ValueError("Flat vector indexes only support bq compression")
+            return Configure.VectorIndex.flat(
+                distance_metric=distance, quantizer=quantizer, **options
+            )
+        if index_type == "hnsw":
+            return Configure.VectorIndex.hnsw(
+                distance_metric=distance, quantizer=quantizer, **options
+            )
+        raise ValueError(f"Unknown vector index type: {index_type}")
 
-        class_obj = weaviate.Collection(
-            name="ChEMBLCompound",
-            description="A chemical compound from ChEMBL database",
-            properties=properties,
-            vectorizer_config=weaviate.config.Configure.Vectorizer.none()
-        )
+    def create_schema(self, vector_index=None, searchable_description=None):
+        """
+        Create the Weaviate schema for ChEMBL compounds.
+        
+        The vector index profile is a dict with the keys:
+            type (str): "hnsw" (default) or "flat" for small collections
+            distance (str): Distance metric, e.g. "cosine" (default), "dot" or "l2-squared"
+            compression (str): None, "pq", "bq" or "sq"
+            compression_options (dict): Extra arguments for the quantizer,
+                e.g. {"segments": 96} for PQ
+        Any other keys (ef, ef_construction, max_connections, ...) are passed
+        to the index configuration. A plain string selects the index type.
+        
+        Inverted index options for each property come from PROPERTY_INDEXES.
+        
+        Args:
+            vector_index (dict or str): Vector index profile (defaults to the
+                importer's vector_index, then to the server defaults)
+            searchable_description (bool): Build a keyword (BM25) index on description
+                (defaults to the importer's searchable_description)
+        """
+        if searchable_description is None:
+            searchable_description = self.searchable_description
+        fields = [(name, data_type) for name, data_type, _ in self.compound_fields]
+        fields += [("description", "TEXT"), ("content_hash", "TEXT")]
+        
+        properties = []
+        for name, data_type in fields:
+            options = dict(PROPERTY_INDEXES.get(name, {}))
+            if name == "description" and searchable_description:
+                options["index_searchable"] = True
+            properties.append(
+                Property(name=name, data_type=getattr(DataType, data_type), **options)
+            )
         
         try:
-            self.client.collections.create(class_obj)
+            self.client.collections.create(
+                name="ChEMBLCompound",
+                description="A chemical compound from ChEMBL database",
+                properties=properties,
+                vectorizer_config=Configure.Vectorizer.none(),
+                vector_index_config=self._vector_index_config(vector_index or self.vector_index)
+            )
             logger.info("Schema created successfully")
         except Exception as e:
             logger.error(f"Error creating schema: {str(e)}")
             raise
 
+    def _molecule_query(self):
+        """Build the lazy ChEMBL molecule query set used by the importer."""
+        molecule = self.chembl_client.molecule
+        # Only request the fields that are stored, not full molecule records
+        fields = [name for name, _, _ in self.compound_fields]
+        return molecule.filter(max_phase__gte=0).order_by(*_API_ORDER).only(*fields)
+
     def fetch_chembl_data(self, limit=1000):
         """
         Fetch compound data from ChEMBL.
@@ -71,14 +388,128 @@ class ChEMBLWeaviateImporter:
             list: List of compound dictionaries
         """
         try:
-            molecule = self.chembl_client.molecule
-            compounds = molecule.filter(max_phase__gte=0).order_by('-max_phase')[:limit]
+            compounds = self._molecule_query()[:limit]
             logger.info(f"Fetched {len(compounds)} compounds from ChEMBL")
             return compounds
         except Exception as e:
             logger.error(f"Error fetching ChEMBL data: {str(e)}")
             raise
 
+    def _fetch_page(self, page_query, size):
+        """Fetch one page of compounds, waiting on the rate limiter first."""
+        if self.rate_limiter is not None:
+            # The client splits a slice into requests of at most MAX_LIMIT records
+            self.rate_limiter.acquire(-(-size // Settings.Instance().MAX_LIMIT))
+        return list(page_query)
+
+    def iter_chembl_data(self, limit=1000, page_size=None, offset=0):
+        """
+        Stream compound data from ChEMBL one page at a time.
+        
+        Up to fetch_workers pages are requested concurrently, throttled by the
+        rate limiter, and yielded in offset order. Only the pages in flight are
+        held in memory, so callers can start processing as soon as the first
+        page arrives regardless of limit.
+        
+        Args:
+            limit (int): Position in the result set to stop fetching at (None
+                fetches until the end of the result set)
+            page_size (int): Number of compounds per page (defaults to batch_size)
+            offset (int): Position in the result set to start fetching from
+        
+        Yields:
+            list: Page of compound dictionaries
+        """
+        page_size = page_size or self.batch_size
+        query = self._molecule_query()
+        if limit is None:
+            # Keep requesting pages until one comes back short
+            offsets = itertools.count(offset, page_size)
+        else:
+            offsets = iter(range(offset, limit, page_size))
+        pending = deque()
+        fetched = 0
+        
+        def submit_next():
+            offset = next(offsets, None)
+            if offset is not None:
+                size = page_size if limit is None else min(page_size, limit - offset)
+                page_query = query[offset:offset + size]
+                pending.append((offset, size, executor.submit(self._fetch_page, page_query, size)))
+        
+        executor = ThreadPoolExecutor(max_workers=self.fetch_workers, thread_name_prefix="chembl-page")
+        try:
+            for _ in range(self.fetch_workers):
+                submit_next()
+            while pending:
+                offset, size, future = pending.popleft()
+                page = future.result()
+                if page:
+                    yield page
+                    fetched += len(page)
+                if len(page) < size:
+                    # Reached the end of the result set
+                    break
+                submit_next()
+            logger.info(f"Fetched {fetched} compounds from ChEMBL")
+        except Exception as e:
+            logger.error(f"Error fetching ChEMBL data at offset {offset}: {str(e)}")
+            raise
+        finally:
+            for _, _, future in pending:
+                future.cancel()
+            executor.shutdown(wait=True)
+
+    def iter_chembl_sqlite(self, limit=None, page_size=None, offset=0):
+        """
+        Stream compound data from a local ChEMBL SQLite release.
+        
+        Rows are read from molecule_dictionary with fetchmany(), so only one
+        page is held in memory. Compounds have the same keys as those returned
+        by the web API.
+        
+        Args:
+            limit (int): Position in the result set to stop reading at (None for all)
+            page_size (int): Number of compounds per page (defaults to batch_size)
+            offset (int): Position in the result set to start reading from
+        
+        Yields:
+            list: Page of compound dictionaries
+        """
+        page_size = page_size or self.batch_size
+        names = [name for name, _, _ in self.compound_fields]
+        columns = ", ".join(
+            f"{_SQLITE_COLUMNS.get(name, name)} AS {name}" for name in names
+        )
+        sql = (
+            f"SELECT {columns} FROM molecule_dictionary "
+            f"WHERE max_phase >= 0 ORDER BY {_SQLITE_ORDER}"
+        )
+        # SQLite treats a negative LIMIT as no limit
+        sql += " LIMIT ? OFFSET ?"
+        params = (limit - offset if limit is not None else -1, offset)
+        
+        conn = sqlite3.connect(f"file:{self.chembl_db_path}?mode=ro", uri=True)
+        fetched = 0
+        try:
+            cursor = conn.execute(sql, params)
+            while True:
+                rows = cursor.fetchmany(page_size)
+                if not rows:
+                    break
+                page = [dict(zip(names, row)) for row in rows]
+                for compound in page:
+                    if "therapeutic_flag" in compound:
+                        compound["therapeutic_flag"] = bool(compound["therapeutic_flag"])
+                yield page
+                fetched += len(page)
+            logger.info(f"Read {fetched} compounds from {self.chembl_db_path}")
+        except Exception as e:
+            logger.error(f"Error reading ChEMBL database: {str(e)}")
+            raise
+        finally:
+            conn.close()
+
     def create_compound_description(self, compound):
         """
         Create a textual description of the compound for embedding.
@@ -106,71 +537,475 @@ class ChEMBLWeaviateImporter:
         
         return description.strip()
 
-    def process_batch(self, compounds, collection):
+    def _content_hash(self, data_object):
+        """Hash the stored properties together with the embedding backend and model."""
+        payload = json.dumps(data_object, sort_keys=True, default=str)
+        embedding_id = backend_id(self.embedding_backend, MODEL_NAME)
+        return hashlib.sha256(f"{embedding_id}\0{payload}".encode("utf-8")).hexdigest()
+
+    def _stored_hashes(self, collection, uuids):
         """
-        Process a batch of compounds and import them into Weaviate.
+        Look up the content hashes of objects already stored in Weaviate.
+        
+        Args:
+            collection: Weaviate collection object
+            uuids (list): Object UUIDs to look up
+        
+        Returns:
+            dict: Stored content hash keyed by object UUID
+        """
+        response = collection.query.fetch_objects(
+            filters=Filter.by_id().contains_any(uuids),
+            limit=len(uuids),
+            return_properties=["content_hash"]
+        )
+        return {str(obj.uuid): obj.properties.get("content_hash") for obj in response.objects}
+
+    def embed_batch(self, compounds, collection=None):
+        """
+        Build data objects and embeddings for a batch of compounds.
+        
+        When skip_unchanged is set and a collection is given, compounds whose
+        stored content hash matches are dropped before encoding.
         
         Args:
             compounds (list): List of compound dictionaries to process
+            collection: Weaviate collection to compare content hashes against
+        
+        Returns:
+            list: List of (data_object, embedding) tuples
+        """
+        data_objects, wait = self._start_embedding(compounds, collection)
+        return list(zip(data_objects, wait()))
+
+    def _start_embedding(self, compounds, collection=None):
+        """
+        Build data objects for a batch and start encoding their descriptions.
+        
+        Args:
+            compounds (list): List of compound dictionaries to process
+            collection: Weaviate collection to compare content hashes against
+        
+        Returns:
+            tuple: Data objects still to be written, and a function that waits
+                for their embeddings (see _encode_async)
+        """
+        data_objects = []
+        for compound in compounds:
+            # Prepare data object
+            data_object = {
+                name: compound.get(name, default)
+                for name, _, default in self.compound_fields
+            }
+            data_object["molecule_chembl_id"] = compound["molecule_chembl_id"]
+            data_object["description"] = self.create_compound_description(compound)
+            data_object["content_hash"] = self._content_hash(data_object)
+            data_objects.append(data_object)
+        
+        if self.skip_unchanged and collection is not None and data_objects:
+            stored = self._stored_hashes(
+                collection,
+                [generate_uuid5(o["molecule_chembl_id"]) for o in data_objects]
+            )
+            data_objects = [
+                o for o in data_objects
+                if stored.get(generate_uuid5(o["molecule_chembl_id"])) != o["content_hash"]
+            ]
+            if not data_objects:
+                return [], lambda: []
+        
+        # Generate embeddings for all descriptions in one batched call
+        return data_objects, self._encode_async([o["description"] for o in data_objects])
+
+    def write_batch(self, objects, collection):
+        """
+        Write embedded data objects into Weaviate.
+        
+        Objects rejected by the server are retried with exponential backoff.
+        Objects that still fail are appended to self.failed_objects.
+        
+        Args:
+            objects (list): List of (data_object, embedding) tuples
             collection: Weaviate collection object
+        
+        Returns:
+            int: Number of objects that could not be written
         """
+        failed = 0
         with collection.batch.dynamic() as batch:
-            for compound in compounds:
-                description = self.create_compound_description(compound)
-                
-                # Generate embedding for the description
-                embedding = self.model.encode(description)
-                
-                # Prepare data object
-                data_object = {
-                    "molecule_chembl_id": compound["molecule_chembl_id"],
-                    "pref_name": compound.get("pref_name", ""),
-                    "molecule_type": compound.get("molecule_type", ""),
-                    "max_phase": compound.get("max_phase", 0),
-                    "therapeutic_flag": compound.get("therapeutic_flag", False),
-                    "structure_type": compound.get("structure_type", ""),
-                    "description": description
-                }
-                
+            for data_object, embedding in objects:
                 # Add object to Weaviate
                 try:
                     batch.add_object(
                         properties=data_object,
                         vector=embedding.tolist(),
-                        uuid=generate_uuid5(compound["molecule_chembl_id"])
+                        uuid=generate_uuid5(data_object["molecule_chembl_id"])
                     )
                 except Exception as e:
-                    logger.error(f"Error adding compound {compound['molecule_chembl_id']}: {str(e)}")
+                    logger.error(f"Error adding compound {data_object['molecule_chembl_id']}: {str(e)}")
+                    self._record_failure(data_object["molecule_chembl_id"], str(e))
+                    failed += 1
+        
+        return failed + self._retry_failed(collection)
+
+    def _retry_failed(self, collection):
+        """
+        Retry objects the server rejected in the last batch.
+        
+        Args:
+            collection: Weaviate collection object
+        
+        Returns:
+            int: Number of objects still failing after all retries
+        """
+        errors = collection.batch.failed_objects
+        delay = self.retry_backoff
+        for attempt in range(1, self.max_retries + 1):
+            if not errors:
+                return 0
+            logger.warning(
+                f"Retrying {len(errors)} failed objects in {delay:.1f}s "
+                f"(attempt {attempt}/{self.max_retries})"
+            )
+            time.sleep(delay)
+            delay *= 2
+            with collection.batch.dynamic() as batch:
+                for error in errors:
+                    batch.add_object(
+                        properties=error.object_.properties,
+                        vector=error.object_.vector,
+                        uuid=error.object_.uuid
+                    )
+            errors = collection.batch.failed_objects
+        
+        for error in errors:
+            self._record_failure(error.object_.properties["molecule_chembl_id"], error.message)
+        return len(errors)
+
+    def _record_failure(self, chembl_id, message):
+        """Remember an object that could not be written."""
+        self.failed_objects.append({"molecule_chembl_id": chembl_id, "message": message})
+
+    def process_batch(self, compounds, collection):
+        """
+        Process a batch of compounds and import them into Weaviate.
+        
+        Args:
+            compounds (list): List of compound dictionaries to process
+            collection: Weaviate collection object
+        """
+        self.write_batch(self.embed_batch(compounds, collection), collection)
+
+    @staticmethod
+    def _put(out_queue, item, stop):
+        """Put an item on a bounded queue, giving up if the pipeline is stopping."""
+        while not stop.is_set():
+            try:
+                out_queue.put(item, timeout=0.1)
+                return
+            except queue.Full:
+                continue
+
+    @staticmethod
+    def _drain(in_queue, stop):
+        """Yield items from a queue until the end-of-stream marker or a stop."""
+        while not stop.is_set():
+            try:
+                item = in_queue.get(timeout=0.1)
+            except queue.Empty:
+                continue
+            if item is _SENTINEL:
+                return
+            yield item
+
+    def _run_stage(self, source, func, out_queue, stop, errors):
+        """
+        Apply func to every item from source and pass results downstream.
+
+        Stops pulling from source as soon as any stage fails, and closes it so
+        generators can release their resources (e.g. cancel pending page fetches).
+        """
+        try:
+            for item in source:
+                self._put(out_queue, func(item), stop)
+                if stop.is_set():
+                    break
+        except Exception as e:
+            errors.append(e)
+            stop.set()
+        finally:
+            if hasattr(source, "close"):
+                source.close()
+            self._put(out_queue, _SENTINEL, stop)
+
+    def _source_id(self):
+        """Identify the compound source and ordering that checkpoint offsets refer to."""
+        if self.chembl_db_path:
+            return f"sqlite:{os.path.abspath(self.chembl_db_path)} order by {_SQLITE_ORDER}"
+        return f"api:{CHEMBL_API_URL} order by {','.join(_API_ORDER)}"
+
+    def _load_checkpoint(self):
+        """
+        Load the saved import checkpoint, or an empty one if there is none.
+        
+        Raises:
+            ValueError: If the checkpoint was written for a different source
+        """
+        source = self._source_id()
+        if self.checkpoint_path and os.path.exists(self.checkpoint_path):
+            with open(self.checkpoint_path) as f:
+                checkpoint = json.load(f)
+            if checkpoint.get("source") != source:
+                raise ValueError(
+                    f"Checkpoint {self.checkpoint_path} was written for "
+                    f"{checkpoint.get('source') or 'an unknown source'}, not {source}; "
+                    "delete it to start a new import"
+                )
+            logger.info(
+                f"Resuming import at offset {checkpoint['offset']} "
+                f"(last compound {checkpoint.get('last_molecule_chembl_id')})"
+            )
+            return checkpoint
+        return {
+            "source": source,
+            "offset": 0,
+            "last_molecule_chembl_id": None,
+            "imported": 0,
+            "skipped": 0,
+            "failed": 0,
+        }
+
+    def _save_checkpoint(self, checkpoint):
+        """Atomically persist the import checkpoint."""
+        if not self.checkpoint_path:
+            return
+        tmp_path = f"{self.checkpoint_path}.tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(checkpoint, f)
+        os.replace(tmp_path, self.checkpoint_path)
 
-    def import_data(self, limit=1000):
+    def _commit(self, consumed, objects, collection, checkpoint, progress):
+        """
+        Write a batch to Weaviate and checkpoint it once the batch is flushed.
+        
+        Args:
+            consumed (int): Number of source compounds the batch was built from
+            objects (list): List of (data_object, embedding) tuples to write
+            collection: Weaviate collection object
+            checkpoint (dict): Import checkpoint to update
+            progress: Progress bar to update
+        """
+        failed = self.write_batch(objects, collection) if objects else 0
+        checkpoint["offset"] += consumed
+        checkpoint["imported"] += len(objects) - failed
+        checkpoint["skipped"] = checkpoint.get("skipped", 0) + consumed - len(objects)
+        checkpoint["failed"] = checkpoint.get("failed", 0) + failed
+        if objects:
+            checkpoint["last_molecule_chembl_id"] = objects[-1][0]["molecule_chembl_id"]
+        self._save_checkpoint(checkpoint)
+        progress.update(consumed)
+
+    def _import_pipelined(self, pages, collection, queue_size, checkpoint, progress):
+        """
+        Import compounds with fetch, embedding and Weaviate writes running concurrently.
+        
+        Each stage runs in its own thread and hands batches to the next through a
+        bounded queue, so a slow stage applies backpressure to the ones before it.
+        Batches reach the writer in source order, so checkpoints stay contiguous.
+        
+        With embed_workers, the embedding stage only queues each batch on the
+        worker pool and the writer waits for its embeddings, so up to about
+        queue_size batches are encoding at once. Use a queue_size of at least
+        embed_workers to keep every worker busy.
+        
+        Args:
+            pages: Iterable of compound batches, consumed by the fetch stage
+            collection: Weaviate collection object
+            queue_size (int): Maximum number of batches buffered between stages
+            checkpoint (dict): Import checkpoint updated after each written batch
+            progress: Progress bar updated after each written batch
+        """
+        fetched = queue.Queue(maxsize=queue_size)
+        embedded = queue.Queue(maxsize=queue_size)
+        stop = threading.Event()
+        errors = []
+        
+        stages = [
+            threading.Thread(
+                target=self._run_stage,
+                args=(iter(pages), lambda b: b, fetched, stop, errors),
+                name="chembl-fetch",
+                daemon=True
+            ),
+            threading.Thread(
+                target=self._run_stage,
+                args=(
+                    self._drain(fetched, stop),
+                    lambda b: (len(b), *self._start_embedding(b, collection)),
+                    embedded,
+                    stop,
+                    errors
+                ),
+                name="chembl-embed",
+                daemon=True
+            ),
+        ]
+        for stage in stages:
+            stage.start()
+        
+        try:
+            for consumed, data_objects, wait in self._drain(embedded, stop):
+                objects = list(zip(data_objects, wait()))
+                self._commit(consumed, objects, collection, checkpoint, progress)
+        finally:
+            stop.set()
+            for stage in stages:
+                stage.join()
+        
+        if errors:
+            raise errors[0]
+
+    @staticmethod
+    def _track_ids(pages, source_ids):
+        """Pass pages through unchanged while recording each compound's object UUID."""
+        for page in pages:
+            for compound in page:
+                source_ids.add(uuid.UUID(generate_uuid5(compound["molecule_chembl_id"])).bytes)
+            yield page
+
+    def delete_stale_objects(self, collection, source_ids, delete_batch_size=1000):
+        """
+        Delete stored compounds that are no longer present in the source.
+        
+        Stored objects are streamed with the collection iterator, so only the
+        source IDs and one batch of stale UUIDs are held in memory.
+        
+        Args:
+            collection: Weaviate collection object
+            source_ids (set): 16-byte object UUIDs of every compound in the source
+            delete_batch_size (int): Number of objects removed per delete request
+        
+        Returns:
+            int: Number of objects deleted
+        """
+        deleted = 0
+        stale = []
+        
+        def flush():
+            nonlocal deleted
+            result = collection.data.delete_many(where=Filter.by_id().contains_any(stale))
+            deleted += result.successful
+            if result.failed:
+                logger.warning(f"Failed to delete {result.failed} stale compounds")
+            stale.clear()
+        
+        for obj in collection.iterator(return_properties=[]):
+            if obj.uuid.bytes not in source_ids:
+                stale.append(obj.uuid)
+                if len(stale) >= delete_batch_size:
+                    flush()
+        if stale:
+            flush()
+        
+        logger.info(f"Deleted {deleted} stale compounds from Weaviate")
+        return deleted
+
+    def import_data(self, limit=1000, pipeline=False, queue_size=4, sync=False):
         """
         Main method to import ChEMBL data into Weaviate.
         
+        If a checkpoint_path is configured, progress is saved after every
+        flushed batch and an interrupted import resumes where it stopped.
+        A checkpoint can only be resumed against the source it was written
+        for. The checkpoint is removed once the import completes.
+        
+        With sync enabled, compounds stored in Weaviate but missing from the
+        source are deleted afterwards. This requires a complete, uninterrupted
+        pass over the source, so run it with limit=None; deletion is skipped
+        when resuming from a checkpoint or when the source was cut short by limit.
+        
+        If anything was written or deleted, the collection version token is
+        bumped so that query result caches are invalidated, including when the
+        import fails part-way through.
+        
         Args:
-            limit (int): Number of compounds to import
+            limit (int): Number of compounds to import (None imports the whole source)
+            pipeline (bool): Overlap fetching, embedding and writing in separate stages
+            queue_size (int): Maximum number of batches buffered between pipeline stages
+            sync (bool): Delete stored compounds that are no longer in the source
+        
+        Returns:
+            list: Objects that could not be written in this run, with error messages
         """
+        checkpoint = None
+        imported_before = 0
+        deleted = 0
         try:
             # Create schema if it doesn't exist
-            try:
-                collection = self.client.collections.get("ChEMBLCompound")
-            except:
+            if not self.client.collections.exists("ChEMBLCompound"):
                 self.create_schema()
-                collection = self.client.collections.get("ChEMBLCompound")
+            collection = self.client.collections.get("ChEMBLCompound")
             
-            # Fetch data from ChEMBL
-            compounds = self.fetch_chembl_data(limit)
+            self.failed_objects = []
+            checkpoint = self._load_checkpoint()
+            start = checkpoint["offset"]
+            imported_before = checkpoint["imported"]
             
-            # Process compounds in batches
-            for i in tqdm(range(0, len(compounds), self.batch_size)):
-                batch = compounds[i:i + self.batch_size]
-                self.process_batch(batch, collection)
-                time.sleep(0.1)  # Small delay to prevent overwhelming the API
+            # Stream data from ChEMBL page by page
+            if self.chembl_db_path:
+                pages = self.iter_chembl_sqlite(limit, offset=start)
+            else:
+                pages = self.iter_chembl_data(limit, offset=start)
             
-            logger.info(f"Successfully imported {len(compounds)} compounds into Weaviate")
+            source_ids = set()
+            if sync:
+                pages = self._track_ids(pages, source_ids)
+            
+            with tqdm(total=limit, initial=start) as progress:
+                if pipeline:
+                    self._import_pipelined(pages, collection, queue_size, checkpoint, progress)
+                else:
+                    # Process compounds in batches as pages arrive
+                    for batch in pages:
+                        objects = self.embed_batch(batch, collection)
+                        self._commit(len(batch), objects, collection, checkpoint, progress)
+            
+            if self.checkpoint_path and os.path.exists(self.checkpoint_path):
+                os.remove(self.checkpoint_path)
+            
+            if sync:
+                if start > 0:
+                    logger.warning("Skipping stale object deletion: import was resumed from a checkpoint")
+                elif limit is not None and len(source_ids) >= limit:
+                    logger.warning(
+                        "Skipping stale object deletion: source may have been truncated by limit "
+                        "(use limit=None to sync)"
+                    )
+                else:
+                    # Unknown until deletion finishes; some objects may go even if it fails
+                    deleted = None
+                    deleted = self.delete_stale_objects(collection, source_ids)
+            
+            logger.info(
+                f"Successfully imported {checkpoint['imported']} compounds into Weaviate "
+                f"({checkpoint.get('skipped', 0)} unchanged)"
+            )
+            if self.failed_objects:
+                shown = ", ".join(f["molecule_chembl_id"] for f in self.failed_objects[:20])
+                more = len(self.failed_objects) - 20
+                logger.warning(
+                    f"{len(self.failed_objects)} compounds failed to import: {shown}"
+                    + (f" and {more} more" if more > 0 else "")
+                )
+            return self.failed_objects
             
         except Exception as e:
             logger.error(f"Error during import: {str(e)}")
             raise
+        finally:
+            # Let query utilities know their cached results are out of date
+            if checkpoint is not None and (checkpoint["imported"] > imported_before or deleted != 0):
+                bump_version(self.client, "ChEMBLCompound")
 
 def main():
     """Main function to run the import process."""
@@ -181,7 +1016,10 @@ def main():
     )
     
     # Import data
-    importer.import_data(limit=1000)  # Adjust limit as needed
+    try:
+        importer.import_data(limit=1000)  # Adjust limit as needed
+    finally:
+        importer.close()
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
@@ -1,18 +1,186 @@
 import weaviate
-from sentence_transformers import SentenceTransformer
+from weaviate.classes.query import Filter, Sort
+from weaviate.exceptions import WeaviateQueryError
+from weaviate.util import generate_uuid5
+from collection_version import get_version
+from embedders import DEFAULT_MODEL_NAME, get_embedder
+import asyncio
+import json
 import logging
-from typing import List, Dict, Any, Optional
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Dict, Any, Iterator, Optional, Tuple
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
-class ChEMBLQueryUtil:
-    def __init__(self, weaviate_url: str = "http://localhost:8080"):
+# Where-filter operators and the matching Filter methods
+_FILTER_OPERATORS = {
+    "Equal": "equal",
+    "NotEqual": "not_equal",
+    "GreaterThan": "greater_than",
+    "GreaterThanEqual": "greater_or_equal",
+    "LessThan": "less_than",
+    "LessThanEqual": "less_or_equal",
+    "Like": "like",
+    "ContainsAny": "contains_any",
+    "ContainsAll": "contains_all",
+    "IsNull": "is_none",
+}
+
+def to_filter(where: Optional[Dict]):
+    """
+    Convert a where-filter dict into a Weaviate Filter.
+    
+    Args:
+        where (dict): Filter such as {"path": ["max_phase"], "operator":
+            "GreaterThanEqual", "valueNumber": 3}, optionally combined with
+            "And"/"Or" and "operands". Filter objects are returned unchanged.
+            
+    Returns:
+        Filter for the query, or None if where is empty
+    """
+    if not where or not isinstance(where, dict):
+        return where or None
+    operator = where["operator"]
+    if operator in ("And", "Or"):
+        operands = [to_filter(operand) for operand in where["operands"]]
+        return Filter.all_of(operands) if operator == "And" else Filter.any_of(operands)
+    if operator not in _FILTER_OPERATORS:
+        raise ValueError(f"Unsupported filter operator: {operator}")
+    value_keys = [k for k in where if k.startswith("value")]
+    if not value_keys:
+        raise ValueError(f"Filter on {where.get('path')} has no value")
+    value = where[value_keys[0]]
+    return getattr(Filter.by_property(where["path"][-1]), _FILTER_OPERATORS[operator])(value)
+
+class LRUCache:
+    def __init__(self, maxsize: int = 1024, ttl: Optional[float] = None):
+        """
+        Initialize a thread-safe LRU cache with optional expiry.
+        
+        Args:
+            maxsize (int): Maximum number of entries to keep
+            ttl (float): Seconds an entry stays valid (None for no expiry)
+        """
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        """Return the cached value for key, or None on a miss."""
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is not None:
+                value, stored_at = entry
+                if self.ttl is None or time.monotonic() - stored_at < self.ttl:
+                    self._data.move_to_end(key)
+                    self.hits += 1
+                    return value
+                del self._data[key]
+            self.misses += 1
+            return None
+
+    def put(self, key, value) -> None:
+        """Store a value, evicting the least recently used entry if full."""
+        if self.maxsize <= 0:
+            return
+        with self._lock:
+            self._data[key] = (value, time.monotonic())
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def clear(self) -> None:
+        """Remove all entries and reset the counters."""
+        with self._lock:
+            self._data.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def info(self) -> Dict[str, Any]:
+        """Return hit/miss counters and current size."""
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "size": len(self._data),
+                "maxsize": self.maxsize,
+            }
+
+class QueryEmbeddingMixin:
+    """Query embedding with an LRU cache; expects self.model and self.query_cache."""
+
+    def embed_query(self, query: str):
+        """
+        Embed a query string, reusing the cached vector for repeated queries.
+        
+        Args:
+            query (str): Query text
+            
+        Returns:
+            numpy.ndarray: Query embedding
+        """
+        return self.embed_queries([query])[0]
+
+    def embed_queries(self, queries: List[str], batch_size: int = 64) -> List[Any]:
+        """
+        Embed many query strings, encoding all uncached queries in one batched call.
+        
+        Args:
+            queries (list): Query texts
+            batch_size (int): Number of queries per model forward pass
+            
+        Returns:
+            list: Query embeddings, in input order
+        """
+        embeddings = [self.query_cache.get(query) for query in queries]
+        missing = list(dict.fromkeys(q for q, e in zip(queries, embeddings) if e is None))
+        if missing:
+            encoded = dict(zip(missing, self.model.encode(missing, batch_size=batch_size)))
+            for query, embedding in encoded.items():
+                self.query_cache.put(query, embedding)
+            embeddings = [e if e is not None else encoded[q] for q, e in zip(queries, embeddings)]
+        return embeddings
+
+def _to_results(objects, exclude_id: Optional[str] = None) -> List[Dict[str, Any]]:
+    """Convert near-vector hits to result dicts with a certainty score."""
+    return [
+        {
+            **obj.properties,
+            "certainty": 1 - obj.metadata.distance
+        }
+        for obj in objects
+        if exclude_id is None or str(obj.uuid) != exclude_id
+    ]
+
+class ChEMBLQueryUtil(QueryEmbeddingMixin):
+    def __init__(self,
+                 weaviate_url: str = "http://localhost:8080",
+                 embedding_backend: str = "sentence-transformers",
+                 query_cache_size: int = 1024,
+                 query_cache_ttl: Optional[float] = None,
+                 result_cache_size: int = 0,
+                 result_cache_ttl: Optional[float] = None,
+                 version_check_interval: float = 5.0):
         """
         Initialize the ChEMBL query utility.
         
         Args:
             weaviate_url (str): URL of the Weaviate instance
+            embedding_backend (str): Embedding backend: "sentence-transformers",
+                "onnx" or "onnx-int8"
+            query_cache_size (int): Number of query embeddings to cache (0 disables caching)
+            query_cache_ttl (float): Seconds a cached query embedding stays valid
+            result_cache_size (int): Number of search results to cache (0 disables caching)
+            result_cache_ttl (float): Seconds cached search results stay valid
+            version_check_interval (float): Seconds between checks of the collection
+                version token that invalidates cached results after an import
         """
         self.client = weaviate.WeaviateClient(
             connection_params=weaviate.connect.ConnectionParams.from_url(
@@ -22,49 +190,164 @@ class ChEMBLQueryUtil:
         )
         self.client.connect()
         self.collection = self.client.collections.get("ChEMBLCompound")
-        self.model = SentenceTransformer('all-MiniLM-L6-v2')
+        self.model = get_embedder(embedding_backend, DEFAULT_MODEL_NAME)
+        self.query_cache = LRUCache(query_cache_size, query_cache_ttl)
+        self.result_cache = LRUCache(result_cache_size, result_cache_ttl) if result_cache_size else None
+        self.version_check_interval = version_check_interval
+        self._version = None
+        self._version_checked_at = None
+        self._version_lock = threading.Lock()
+
+    def collection_version(self) -> Optional[str]:
+        """
+        Get the collection version token, re-reading it at most every
+        version_check_interval seconds.
+        
+        Returns:
+            str: The current version token, or None if it has never been bumped
+        """
+        with self._version_lock:
+            now = time.monotonic()
+            if (self._version_checked_at is None
+                    or now - self._version_checked_at >= self.version_check_interval):
+                self._version = get_version(self.client, "ChEMBLCompound")
+                self._version_checked_at = now
+            return self._version
+
+    def _result_key(self,
+                    method: str,
+                    subject: str,
+                    limit: int,
+                    filters: Optional[Dict] = None,
+                    return_properties: Optional[List[str]] = None):
+        """Build a result cache key tied to the current collection version."""
+        filters_key = json.dumps(filters, sort_keys=True, default=str) if filters else None
+        properties_key = tuple(return_properties) if return_properties is not None else None
+        return (method, subject, limit, filters_key, properties_key, self.collection_version())
+
+    def _get_cached_results(self, key) -> Optional[List[Dict[str, Any]]]:
+        """Return a copy of cached results, or None if they are not cached."""
+        if self.result_cache is None:
+            return None
+        results = self.result_cache.get(key)
+        return [dict(r) for r in results] if results is not None else None
+
+    def _cache_results(self, key, results: List[Dict[str, Any]]) -> None:
+        """Store a copy of results so callers cannot modify the cached entry."""
+        if self.result_cache is not None:
+            self.result_cache.put(key, [dict(r) for r in results])
+
+    def _near_vector(self,
+                     vector,
+                     limit: int,
+                     filters=None,
+                     return_properties: Optional[List[str]] = None,
+                     exclude_id: Optional[str] = None) -> List[Dict[str, Any]]:
+        """Run a near-vector search and convert hits to result dicts."""
+        results = self.collection.query.near_vector(
+            near_vector=vector.tolist() if hasattr(vector, "tolist") else vector,
+            limit=limit,
+            filters=filters,
+            return_properties=return_properties,
+            return_metadata=["distance"]
+        ).objects
+        
+        # Convert to more friendly format
+        return _to_results(results, exclude_id)
 
     def semantic_search(self, 
                     query: str, 
                     limit: int = 5, 
-                    additional_filters: Optional[Dict] = None) -> List[Dict[str, Any]]:
+                    additional_filters: Optional[Dict] = None,
+                    return_properties: Optional[List[str]] = None) -> List[Dict[str, Any]]:
         try:
+            cache_key = None
+            if self.result_cache is not None:
+                cache_key = self._result_key(
+                    "semantic_search", query, limit, additional_filters, return_properties
+                )
+                cached = self._get_cached_results(cache_key)
+                if cached is not None:
+                    return cached
+            
             # Generate embedding for the query
-            query_embedding = self.model.encode(query)
+            query_embedding = self.embed_query(query)
             
-            # Prepare and execute the query
-            query_obj = self.collection.query.near_vector(
-                near_vector=query_embedding.tolist(),
-                limit=limit,
-                # Updated metadata configuration
-                return_metadata=["distance"]  # Changed from weaviate.metadata.Metadata(distance=True)
+            results = self._near_vector(
+                query_embedding, limit, to_filter(additional_filters), return_properties
             )
+            if cache_key is not None:
+                self._cache_results(cache_key, results)
+            return results
             
-            if additional_filters:
-                query_obj = query_obj.with_where(additional_filters)
-                
-            results = query_obj.objects
+        except Exception as e:
+            logger.error(f"Error in semantic search: {str(e)}")
+            raise
+
+    def semantic_search_many(self,
+                             queries: List[str],
+                             limit: int = 5,
+                             additional_filters: Optional[Dict] = None,
+                             max_concurrency: int = 16,
+                             return_properties: Optional[List[str]] = None) -> List[List[Dict[str, Any]]]:
+        """
+        Run semantic search for many queries at once.
+        
+        All uncached queries are embedded in one batched call and the searches
+        are issued concurrently over the client's connection.
+        
+        Args:
+            queries (list): Natural language queries
+            limit (int): Maximum number of results per query
+            additional_filters (dict): Where-filter applied to every query
+            max_concurrency (int): Maximum number of searches in flight
+            return_properties (list): Properties to return (None returns all)
             
-            # Convert to more friendly format
-            return [
-                {
-                    **obj.properties,
-                    "certainty": 1 - obj.metadata.distance
-                }
-                for obj in results
-            ]
+        Returns:
+            list: One result list per query, in input order
+        """
+        try:
+            results = [None] * len(queries)
+            cache_keys = [None] * len(queries)
+            if self.result_cache is not None:
+                for i, query in enumerate(queries):
+                    cache_keys[i] = self._result_key(
+                        "semantic_search", query, limit, additional_filters, return_properties
+                    )
+                    results[i] = self._get_cached_results(cache_keys[i])
+            
+            pending = [i for i, r in enumerate(results) if r is None]
+            if not pending:
+                return results
+            
+            embeddings = self.embed_queries([queries[i] for i in pending])
+            filters = to_filter(additional_filters)
+            with ThreadPoolExecutor(max_workers=min(max_concurrency, len(pending))) as executor:
+                found = executor.map(
+                    lambda e: self._near_vector(e, limit, filters, return_properties),
+                    embeddings
+                )
+                for i, hits in zip(pending, found):
+                    results[i] = hits
+                    if cache_keys[i] is not None:
+                        self._cache_results(cache_keys[i], hits)
+            return results
             
         except Exception as e:
-            logger.error(f"Error in semantic search: {str(e)}")
+            logger.error(f"Error in batch semantic search: {str(e)}")
             raise
 
-    def filter_by_phase(self, min_phase: int = 0, limit: int = 5) -> List[Dict[str, Any]]:
+    def filter_by_phase(self,
+                        min_phase: int = 0,
+                        limit: int = 5,
+                        return_properties: Optional[List[str]] = None) -> List[Dict[str, Any]]:
         """
         Filter compounds by their clinical trial phase.
         
         Args:
             min_phase (int): Minimum clinical trial phase
             limit (int): Maximum number of results to return
+            return_properties (list): Properties to return (None returns all)
             
         Returns:
             list: List of matching compounds
@@ -76,12 +359,11 @@ class ChEMBLQueryUtil:
                 "valueNumber": min_phase
             }
             
-            results = (
-                self.collection.query.get()
-                .with_where(where_filter)
-                .with_limit(limit)
-                .objects
-            )
+            results = self.collection.query.fetch_objects(
+                filters=to_filter(where_filter),
+                limit=limit,
+                return_properties=return_properties
+            ).objects
             
             return [obj.properties for obj in results]
             
@@ -89,61 +371,324 @@ class ChEMBLQueryUtil:
             logger.error(f"Error in phase filter: {str(e)}")
             raise
 
+    def iter_by_phase(self,
+                      min_phase: int = 0,
+                      page_size: int = 100,
+                      return_properties: Optional[List[str]] = None,
+                      after: Optional[str] = None) -> Iterator[Dict[str, Any]]:
+        """
+        Lazily iterate over all compounds at or above a clinical trial phase.
+        
+        Weaviate's after=uuid cursor cannot be combined with a filter, so this
+        pages with a keyset cursor instead: results are sorted by
+        molecule_chembl_id and each page starts after the last ID seen. Only
+        one page is held in memory and there is no offset limit.
+        
+        Args:
+            min_phase (int): Minimum clinical trial phase
+            page_size (int): Number of compounds fetched per request
+            return_properties (list): Properties to return (None returns all)
+            after (str): ChEMBL ID to resume after, e.g. the last one yielded
+            
+        Yields:
+            dict: Matching compounds, in molecule_chembl_id order
+        """
+        # The cursor needs molecule_chembl_id even if the caller did not ask for it
+        fetch_properties = return_properties
+        strip_id = False
+        if return_properties is not None and "molecule_chembl_id" not in return_properties:
+            fetch_properties = list(return_properties) + ["molecule_chembl_id"]
+            strip_id = True
+        
+        phase_filter = Filter.by_property("max_phase").greater_or_equal(min_phase)
+        try:
+            while True:
+                filters = phase_filter
+                if after is not None:
+                    filters = phase_filter & Filter.by_property("molecule_chembl_id").greater_than(after)
+                
+                page = self.collection.query.fetch_objects(
+                    filters=filters,
+                    sort=Sort.by_property("molecule_chembl_id"),
+                    limit=page_size,
+                    return_properties=fetch_properties
+                ).objects
+                if not page:
+                    return
+                
+                after = page[-1].properties["molecule_chembl_id"]
+                for obj in page:
+                    properties = obj.properties
+                    if strip_id:
+                        properties = {k: v for k, v in properties.items() if k != "molecule_chembl_id"}
+                    yield properties
+                
+                if len(page) < page_size:
+                    return
+                    
+        except Exception as e:
+            logger.error(f"Error iterating by phase: {str(e)}")
+            raise
+
     def get_similar_compounds(self, 
                             chembl_id: str, 
-                            limit: int = 5) -> List[Dict[str, Any]]:
+                            limit: int = 5,
+                            return_properties: Optional[List[str]] = None) -> List[Dict[str, Any]]:
         """
         Find compounds similar to a given ChEMBL ID.
         
         Args:
             chembl_id (str): ChEMBL ID of the reference compound
             limit (int): Maximum number of results to return
+            return_properties (list): Properties to return (None returns all)
             
         Returns:
             list: List of similar compounds
         """
         try:
-            # First, get the reference compound
-            where_filter = {
-                "path": ["molecule_chembl_id"],
-                "operator": "Equal",
-                "valueString": chembl_id
-            }
+            cache_key = None
+            if self.result_cache is not None:
+                cache_key = self._result_key(
+                    "get_similar_compounds", chembl_id, limit, None, return_properties
+                )
+                cached = self._get_cached_results(cache_key)
+                if cached is not None:
+                    return cached
+            
+            # The importer stores each compound under generate_uuid5(chembl_id),
+            # so the reference can be searched from directly in one request
+            reference_id = generate_uuid5(chembl_id)
+            try:
+                similar = self.collection.query.near_object(
+                    near_object=reference_id,
+                    limit=limit + 1,
+                    return_properties=return_properties,
+                    return_metadata=["distance"]
+                ).objects
+            except WeaviateQueryError:
+                if not self.collection.data.exists(reference_id):
+                    raise ValueError(f"No compound found with ChEMBL ID: {chembl_id}")
+                raise
             
-            reference = (
-                self.collection.query.get()
-                .with_where(where_filter)
-                .with_additional(["vector"])
-                .objects
+            # Filter out the reference compound and convert to friendly format
+            results = _to_results(similar, exclude_id=reference_id)[:limit]
+            
+            if cache_key is not None:
+                self._cache_results(cache_key, results)
+            return results
+            
+        except Exception as e:
+            logger.error(f"Error finding similar compounds: {str(e)}")
+            raise
+
+    def get_similar_compounds_many(self,
+                                   chembl_ids: List[str],
+                                   limit: int = 5,
+                                   chunk_size: int = 256,
+                                   max_concurrency: int = 16,
+                                   return_properties: Optional[List[str]] = None
+                                   ) -> Iterator[Tuple[str, Optional[List[Dict[str, Any]]]]]:
+        """
+        Find compounds similar to each of many ChEMBL IDs.
+        
+        IDs are processed in chunks: the reference vectors of a chunk are
+        fetched in one request, then the near-vector searches run concurrently.
+        Results are yielded as each chunk completes, so only one chunk is held
+        in memory at a time.
+        
+        Args:
+            chembl_ids (list): ChEMBL IDs of the reference compounds
+            limit (int): Maximum number of results per reference compound
+            chunk_size (int): Number of reference compounds fetched per request
+            max_concurrency (int): Maximum number of searches in flight
+            return_properties (list): Properties to return (None returns all)
+            
+        Yields:
+            tuple: (chembl_id, similar compounds), in input order. The results
+                are None if the reference compound does not exist.
+        """
+        try:
+            with ThreadPoolExecutor(max_workers=max_concurrency) as executor:
+                for i in range(0, len(chembl_ids), chunk_size):
+                    chunk = chembl_ids[i:i + chunk_size]
+                    vectors = self._reference_vectors(chunk)
+                    
+                    def search(chembl_id):
+                        vector = vectors.get(chembl_id)
+                        if vector is None:
+                            return None
+                        return self._near_vector(
+                            vector,
+                            limit + 1,
+                            return_properties=return_properties,
+                            exclude_id=generate_uuid5(chembl_id)
+                        )[:limit]
+                    
+                    for chembl_id, results in zip(chunk, executor.map(search, chunk)):
+                        if results is None:
+                            logger.warning(f"No compound found with ChEMBL ID: {chembl_id}")
+                        yield chembl_id, results
+                        
+        except Exception as e:
+            logger.error(f"Error finding similar compounds: {str(e)}")
+            raise
+
+    def _reference_vectors(self, chembl_ids: List[str]) -> Dict[str, List[float]]:
+        """Fetch the stored vectors of many compounds in one request, keyed by ChEMBL ID."""
+        ids = {generate_uuid5(chembl_id): chembl_id for chembl_id in chembl_ids}
+        response = self.collection.query.fetch_objects(
+            filters=Filter.by_id().contains_any(list(ids)),
+            limit=len(ids),
+            include_vector=True,
+            return_properties=[]
+        )
+        return {ids[str(obj.uuid)]: obj.vector["default"] for obj in response.objects}
+
+class AsyncChEMBLQueryUtil(QueryEmbeddingMixin):
+    def __init__(self,
+                 weaviate_url: str = "http://localhost:8080",
+                 embedding_backend: str = "sentence-transformers",
+                 query_cache_size: int = 1024,
+                 query_cache_ttl: Optional[float] = None,
+                 executor: Optional[ThreadPoolExecutor] = None):
+        """
+        Initialize the asyncio ChEMBL query utility.
+        
+        Call connect() (or use the instance as an async context manager)
+        before running queries. Query encoding runs in a thread pool so that
+        it does not block the event loop.
+        
+        Args:
+            weaviate_url (str): URL of the Weaviate instance
+            embedding_backend (str): Embedding backend: "sentence-transformers",
+                "onnx" or "onnx-int8"
+            query_cache_size (int): Number of query embeddings to cache (0 disables caching)
+            query_cache_ttl (float): Seconds a cached query embedding stays valid
+            executor (ThreadPoolExecutor): Executor for query encoding
+                (None uses the event loop's default executor)
+        """
+        self.client = weaviate.WeaviateAsyncClient(
+            connection_params=weaviate.connect.ConnectionParams.from_url(
+                url=weaviate_url,
+                grpc_port=50051
+            )
+        )
+        self.collection = None
+        self.model = get_embedder(embedding_backend, DEFAULT_MODEL_NAME)
+        self.query_cache = LRUCache(query_cache_size, query_cache_ttl)
+        self.executor = executor
+
+    async def connect(self) -> None:
+        """Connect to Weaviate."""
+        await self.client.connect()
+        self.collection = self.client.collections.get("ChEMBLCompound")
+
+    async def close(self) -> None:
+        """Close the Weaviate connection."""
+        await self.client.close()
+
+    async def __aenter__(self):
+        await self.connect()
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.close()
+
+    async def _embed(self, query: str):
+        """Embed a query without blocking the event loop."""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self.executor, self.embed_query, query)
+
+    async def semantic_search(self,
+                              query: str,
+                              limit: int = 5,
+                              additional_filters: Optional[Dict] = None,
+                              return_properties: Optional[List[str]] = None) -> List[Dict[str, Any]]:
+        """
+        Find compounds whose descriptions are semantically closest to a query.
+        
+        Args:
+            query (str): Natural language query
+            limit (int): Maximum number of results to return
+            additional_filters (dict): Where-filter to apply
+            return_properties (list): Properties to return (None returns all)
+            
+        Returns:
+            list: List of matching compounds with certainty scores
+        """
+        try:
+            query_embedding = await self._embed(query)
+            response = await self.collection.query.near_vector(
+                near_vector=query_embedding.tolist(),
+                limit=limit,
+                filters=to_filter(additional_filters),
+                return_properties=return_properties,
+                return_metadata=["distance"]
             )
+            return _to_results(response.objects)
             
-            if not reference:
-                raise ValueError(f"No compound found with ChEMBL ID: {chembl_id}")
+        except Exception as e:
+            logger.error(f"Error in semantic search: {str(e)}")
+            raise
+
+    async def filter_by_phase(self,
+                              min_phase: int = 0,
+                              limit: int = 5,
+                              return_properties: Optional[List[str]] = None) -> List[Dict[str, Any]]:
+        """
+        Filter compounds by their clinical trial phase.
+        
+        Args:
+            min_phase (int): Minimum clinical trial phase
+            limit (int): Maximum number of results to return
+            return_properties (list): Properties to return (None returns all)
+            
+        Returns:
+            list: List of matching compounds
+        """
+        try:
+            response = await self.collection.query.fetch_objects(
+                filters=Filter.by_property("max_phase").greater_or_equal(min_phase),
+                limit=limit,
+                return_properties=return_properties
+            )
+            return [obj.properties for obj in response.objects]
             
-            # Get the vector of the reference compound
-            ref_vector = reference[0].metadata.vector
+        except Exception as e:
+            logger.error(f"Error in phase filter: {str(e)}")
+            raise
+
+    async def get_similar_compounds(self,
+                                    chembl_id: str,
+                                    limit: int = 5,
+                                    return_properties: Optional[List[str]] = None) -> List[Dict[str, Any]]:
+        """
+        Find compounds similar to a given ChEMBL ID.
+        
+        Args:
+            chembl_id (str): ChEMBL ID of the reference compound
+            limit (int): Maximum number of results to return
+            return_properties (list): Properties to return (None returns all)
             
-            # Find similar compounds
-            similar = (
-                self.collection.query.near_vector(
-                    near_vector=ref_vector,
+        Returns:
+            list: List of similar compounds
+        """
+        try:
+            reference_id = generate_uuid5(chembl_id)
+            try:
+                similar = await self.collection.query.near_object(
+                    near_object=reference_id,
                     limit=limit + 1,
+                    return_properties=return_properties,
                     return_metadata=["distance"]
                 )
-                .objects
-            )
+            except WeaviateQueryError:
+                if not await self.collection.data.exists(reference_id):
+                    raise ValueError(f"No compound found with ChEMBL ID: {chembl_id}")
+                raise
             
-            # Filter out the reference compound and convert to friendly format
-            results = [
-                {
-                    **obj.properties,
-                    "certainty": 1 - obj.metadata.distance
-                }
-                for obj in similar
-                if obj.properties["molecule_chembl_id"] != chembl_id
-            ][:limit]
-            
-            return results
+            # Filter out the reference compound
+            return _to_results(similar.objects, exclude_id=reference_id)[:limit]
             
         except Exception as e:
             logger.error(f"Error finding similar compounds: {str(e)}")
@@ -0,0 +1,63 @@
+import logging
+import uuid
+from typing import Optional
+
+from weaviate.classes.config import Configure, DataType, Property
+from weaviate.util import generate_uuid5
+
+logger = logging.getLogger(__name__)
+
+# Collection holding one version token per data collection
+VERSION_COLLECTION = "ChEMBLCollectionVersion"
+
+def bump_version(client, collection_name: str = "ChEMBLCompound") -> str:
+    """
+    Record that a collection's contents have changed.
+
+    Args:
+        client: Connected Weaviate client
+        collection_name (str): Name of the collection that changed
+
+    Returns:
+        str: The new version token
+    """
+    if not client.collections.exists(VERSION_COLLECTION):
+        client.collections.create(
+            name=VERSION_COLLECTION,
+            description="Version tokens bumped whenever a collection is re-imported",
+            properties=[
+                Property(name="collection", data_type=DataType.TEXT),
+                Property(name="version", data_type=DataType.TEXT),
+            ],
+            vectorizer_config=Configure.Vectorizer.none()
+        )
+
+    versions = client.collections.get(VERSION_COLLECTION)
+    object_id = generate_uuid5(collection_name)
+    version = uuid.uuid4().hex
+    properties = {"collection": collection_name, "version": version}
+    if versions.data.exists(object_id):
+        versions.data.replace(uuid=object_id, properties=properties)
+    else:
+        versions.data.insert(properties=properties, uuid=object_id)
+
+    logger.info(f"Bumped {collection_name} version to {version}")
+    return version
+
+def get_version(client, collection_name: str = "ChEMBLCompound") -> Optional[str]:
+    """
+    Get a collection's current version token.
+
+    Args:
+        client: Connected Weaviate client
+        collection_name (str): Name of the collection
+
+    Returns:
+        str: The version token, or None if it has never been bumped
+    """
+    if not client.collections.exists(VERSION_COLLECTION):
+        return None
+    obj = client.collections.get(VERSION_COLLECTION).query.fetch_object_by_id(
+        generate_uuid5(collection_name)
+    )
+    return obj.properties["version"] if obj is not None else None
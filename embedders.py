@@ -0,0 +1,286 @@
+import logging
+import os
+import tempfile
+import threading
+from typing import List, Optional
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MODEL_NAME = 'all-MiniLM-L6-v2'
+
+class EmbeddingBackend:
+    """Interface for models that turn texts into sentence embeddings."""
+
+    #: Identifies the vectors a backend produces, e.g. for cache keys
+    name: str
+
+    def encode(self, texts: List[str], batch_size: int = 32) -> np.ndarray:
+        """
+        Encode texts into embeddings.
+
+        Args:
+            texts (list): Texts to encode
+            batch_size (int): Number of texts per forward pass
+
+        Returns:
+            numpy.ndarray: float32 array with one row per text, in input order
+        """
+        raise NotImplementedError
+
+class SentenceTransformerBackend(EmbeddingBackend):
+    def __init__(self, model_name: str = DEFAULT_MODEL_NAME, num_threads: Optional[int] = None):
+        """
+        Initialize a PyTorch backend using sentence-transformers.
+
+        Args:
+            model_name (str): Name of the sentence-transformers model
+            num_threads (int): Number of torch threads (None keeps the torch default)
+        """
+        # Imported here so that importing this module does not pull in torch
+        from sentence_transformers import SentenceTransformer
+        if num_threads:
+            import torch
+            torch.set_num_threads(num_threads)
+        self.name = model_name
+        self.model = SentenceTransformer(model_name)
+
+    def encode(self, texts: List[str], batch_size: int = 32) -> np.ndarray:
+        embeddings = self.model.encode(
+            texts,
+            batch_size=batch_size,
+            show_progress_bar=False
+        )
+        return np.asarray(embeddings, dtype=np.float32)
+
+class OnnxBackend(EmbeddingBackend):
+    def __init__(self,
+                 model_name: str = DEFAULT_MODEL_NAME,
+                 quantize: bool = False,
+                 num_threads: Optional[int] = None,
+                 max_length: int = 256):
+        """
+        Initialize an ONNX Runtime backend for a sentence-transformers model.
+
+        Uses the ONNX export published with the model on the Hugging Face Hub and
+        reproduces its mean pooling and normalization, so vectors match the
+        PyTorch backend within floating point tolerance. With quantize enabled
+        the weights are dynamically quantized to int8 once and cached on disk.
+
+        Args:
+            model_name (str): Name of the sentence-transformers model
+            quantize (bool): Use a dynamically int8-quantized copy of the model
+            num_threads (int): Number of intra-op threads (None keeps the ORT default)
+            max_length (int): Maximum number of tokens per text
+        """
+        try:
+            import onnxruntime as ort
+            from tokenizers import Tokenizer
+        except ImportError as e:
+            raise ImportError(
+                "The ONNX embedding backend requires onnxruntime: pip install onnxruntime"
+            ) from e
+
+        model_path, tokenizer_path = self.model_files(model_name, quantize)
+
+        self.name = backend_id("onnx-int8" if quantize else "onnx", model_name)
+        self.tokenizer = Tokenizer.from_file(tokenizer_path)
+        self.tokenizer.enable_truncation(max_length=max_length)
+        self.tokenizer.enable_padding()
+
+        options = ort.SessionOptions()
+        if num_threads:
+            options.intra_op_num_threads = num_threads
+        self.session = ort.InferenceSession(
+            model_path,
+            sess_options=options,
+            providers=["CPUExecutionProvider"]
+        )
+        self.input_names = {i.name for i in self.session.get_inputs()}
+
+    @classmethod
+    def model_files(cls, model_name: str = DEFAULT_MODEL_NAME, quantize: bool = False):
+        """
+        Download the ONNX model and tokenizer, quantizing the model if requested.
+
+        Args:
+            model_name (str): Name of the sentence-transformers model
+            quantize (bool): Return the int8-quantized model, creating it if needed
+
+        Returns:
+            tuple: Paths of the ONNX model and of tokenizer.json
+        """
+        from huggingface_hub import hf_hub_download
+
+        repo_id = model_name if "/" in model_name else f"sentence-transformers/{model_name}"
+        model_path = hf_hub_download(repo_id, "onnx/model.onnx")
+        tokenizer_path = hf_hub_download(repo_id, "tokenizer.json")
+        if quantize:
+            model_path = cls._quantized_model(model_path)
+        return model_path, tokenizer_path
+
+    @staticmethod
+    def _quantized_model(model_path: str) -> str:
+        """Return the path of an int8-quantized copy of a model, creating it if needed."""
+        quantized_path = os.path.join(os.path.dirname(model_path), "model_dynamic_qint8.onnx")
+        if not os.path.exists(quantized_path):
+            from onnxruntime.quantization import QuantType, quantize_dynamic
+            logger.info(f"Quantizing {model_path} to int8")
+            # A private temporary file, so concurrent processes never write the same file
+            fd, tmp_path = tempfile.mkstemp(
+                dir=os.path.dirname(quantized_path), prefix="model_dynamic_qint8.", suffix=".onnx"
+            )
+            os.close(fd)
+            try:
+                quantize_dynamic(model_path, tmp_path, weight_type=QuantType.QInt8)
+                os.replace(tmp_path, quantized_path)
+            finally:
+                if os.path.exists(tmp_path):
+                    os.remove(tmp_path)
+        return quantized_path
+
+    def encode(self, texts: List[str], batch_size: int = 32) -> np.ndarray:
+        blocks = []
+        for i in range(0, len(texts), batch_size):
+            encodings = self.tokenizer.encode_batch(texts[i:i + batch_size])
+            input_ids = np.array([e.ids for e in encodings], dtype=np.int64)
+            attention_mask = np.array([e.attention_mask for e in encodings], dtype=np.int64)
+            inputs = {"input_ids": input_ids, "attention_mask": attention_mask}
+            if "token_type_ids" in self.input_names:
+                inputs["token_type_ids"] = np.array([e.type_ids for e in encodings], dtype=np.int64)
+
+            token_embeddings = self.session.run(None, inputs)[0]
+
+            # Mean pooling over non-padding tokens, then L2 normalization
+            mask = attention_mask[:, :, None].astype(np.float32)
+            summed = (token_embeddings * mask).sum(axis=1)
+            pooled = summed / np.clip(mask.sum(axis=1), 1e-9, None)
+            norms = np.linalg.norm(pooled, axis=1, keepdims=True)
+            blocks.append(pooled / np.clip(norms, 1e-12, None))
+
+        if not blocks:
+            return np.empty((0, 0), dtype=np.float32)
+        return np.vstack(blocks).astype(np.float32)
+
+#: Backend names accepted by create_backend
+BACKENDS = ("sentence-transformers", "onnx", "onnx-int8")
+
+def backend_id(backend: str, model_name: str = DEFAULT_MODEL_NAME) -> str:
+    """Identify the vectors produced by a backend, without loading it."""
+    if backend == "sentence-transformers":
+        return model_name
+    return f"{model_name}+{backend}"
+
+def create_backend(backend: str = "sentence-transformers",
+                   model_name: str = DEFAULT_MODEL_NAME,
+                   num_threads: Optional[int] = None) -> EmbeddingBackend:
+    """
+    Create an embedding backend by name.
+
+    Args:
+        backend (str): One of BACKENDS
+        model_name (str): Name of the sentence-transformers model
+        num_threads (int): Number of inference threads (None keeps the library default)
+
+    Returns:
+        EmbeddingBackend: The loaded backend
+    """
+    if backend == "sentence-transformers":
+        return SentenceTransformerBackend(model_name, num_threads=num_threads)
+    if backend == "onnx":
+        return OnnxBackend(model_name, num_threads=num_threads)
+    if backend == "onnx-int8":
+        return OnnxBackend(model_name, quantize=True, num_threads=num_threads)
+    raise ValueError(f"Unknown embedding backend: {backend} (expected one of {', '.join(BACKENDS)})")
+
+def prepare_backend(backend: str = "sentence-transformers",
+                    model_name: str = DEFAULT_MODEL_NAME) -> None:
+    """
+    Download and prepare a backend's model files without loading the model.
+
+    Call this before starting worker processes so that they only read the
+    files, rather than each downloading or quantizing them at the same time.
+
+    Args:
+        backend (str): One of BACKENDS
+        model_name (str): Name of the sentence-transformers model
+    """
+    if backend in ("onnx", "onnx-int8"):
+        OnnxBackend.model_files(model_name, quantize=backend == "onnx-int8")
+
+class SharedEmbedder(EmbeddingBackend):
+    def __init__(self, backend: str = "sentence-transformers", model_name: str = DEFAULT_MODEL_NAME):
+        """
+        Initialize a thread-safe embedder that loads its backend on first use.
+
+        Use get_embedder() rather than constructing this directly, so that all
+        callers in a process share one loaded model.
+
+        Args:
+            backend (str): One of BACKENDS
+            model_name (str): Name of the sentence-transformers model
+        """
+        self.backend = backend
+        self.model_name = model_name
+        self.name = backend_id(backend, model_name)
+        self._model = None
+        self._lock = threading.Lock()
+
+    @property
+    def model(self) -> EmbeddingBackend:
+        """The loaded backend, created on first access."""
+        if self._model is None:
+            with self._lock:
+                if self._model is None:
+                    logger.info(f"Loading embedding model {self.name}")
+                    self._model = create_backend(self.backend, self.model_name)
+        return self._model
+
+    def encode(self, texts: List[str], batch_size: int = 32) -> np.ndarray:
+        model = self.model
+        with self._lock:
+            return model.encode(texts, batch_size=batch_size)
+
+_embedders = {}
+_embedders_lock = threading.Lock()
+
+def get_embedder(backend: str = "sentence-transformers",
+                 model_name: str = DEFAULT_MODEL_NAME) -> SharedEmbedder:
+    """
+    Get the process-wide embedder for a backend and model.
+
+    The model itself is loaded the first time something is encoded.
+
+    Args:
+        backend (str): One of BACKENDS
+        model_name (str): Name of the sentence-transformers model
+
+    Returns:
+        SharedEmbedder: The shared embedder
+    """
+    if backend not in BACKENDS:
+        raise ValueError(f"Unknown embedding backend: {backend} (expected one of {', '.join(BACKENDS)})")
+    key = (backend, model_name)
+    with _embedders_lock:
+        if key not in _embedders:
+            _embedders[key] = SharedEmbedder(backend, model_name)
+        return _embedders[key]
+
+# Model loaded by init_embedding_worker in each embedding worker process
+_worker_model = None
+
+def init_embedding_worker(backend: str, model_name: str, num_threads: Optional[int]) -> None:
+    """
+    Load the embedding model once in a worker process.
+
+    Worker pools use this as their initializer. It lives here rather than in
+    the importer so spawned workers only import this module.
+    """
+    global _worker_model
+    _worker_model = create_backend(backend, model_name, num_threads=num_threads)
+
+def encode_chunk(args) -> np.ndarray:
+    """Encode a (texts, batch_size) chunk with the worker process's model."""
+    texts, batch_size = args
+    return _worker_model.encode(texts, batch_size=batch_size)
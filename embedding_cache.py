@@ -0,0 +1,85 @@
+import hashlib
+import logging
+import sqlite3
+import threading
+from typing import List, Optional
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+class EmbeddingCache:
+    def __init__(self, path: str, model_name: str):
+        """
+        Initialize a persistent, content-addressed embedding cache.
+
+        Vectors are stored as float32 blobs in SQLite, keyed by a hash of the
+        model name and the exact text that was embedded.
+
+        Args:
+            path (str): Path to the SQLite database file
+            model_name (str): Name of the embedding model the vectors belong to
+        """
+        self.path = path
+        self.model_name = model_name
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS embeddings ("
+            "key BLOB PRIMARY KEY, vector BLOB NOT NULL) WITHOUT ROWID"
+        )
+        self._conn.commit()
+
+    def _key(self, text: str) -> bytes:
+        return hashlib.sha256(f"{self.model_name}\0{text}".encode("utf-8")).digest()
+
+    def get_many(self, texts: List[str]) -> List[Optional[np.ndarray]]:
+        """
+        Look up cached vectors for a list of texts.
+
+        Args:
+            texts (list): Texts to look up
+
+        Returns:
+            list: Cached float32 vector for each text, or None on a miss
+        """
+        keys = [self._key(text) for text in texts]
+        found = {}
+        with self._lock:
+            # Stay well below SQLite's bound-parameter limit
+            for i in range(0, len(keys), 500):
+                chunk = keys[i:i + 500]
+                rows = self._conn.execute(
+                    f"SELECT key, vector FROM embeddings WHERE key IN ({','.join('?' * len(chunk))})",
+                    chunk
+                ).fetchall()
+                found.update(rows)
+        return [
+            np.frombuffer(found[key], dtype=np.float32) if key in found else None
+            for key in keys
+        ]
+
+    def put_many(self, texts: List[str], vectors) -> None:
+        """
+        Store vectors for a list of texts.
+
+        Args:
+            texts (list): Texts that were embedded
+            vectors: Sequence of vectors, one per text
+        """
+        rows = [
+            (self._key(text), np.asarray(vector, dtype=np.float32).tobytes())
+            for text, vector in zip(texts, vectors)
+        ]
+        with self._lock:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO embeddings (key, vector) VALUES (?, ?)", rows
+            )
+            self._conn.commit()
+
+    def close(self) -> None:
+        """Close the underlying database connection."""
+        with self._lock:
+            self._conn.close()
@@ -0,0 +1,85 @@
+import hashlib
+import os
+import sys
+import types
+from unittest import mock
+
+import numpy as np
+import pytest
+
+# The modules live at the repository root rather than in a package
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# Importing the real new_client contacts the ChEMBL web API, so tests never load it
+_new_client_module = types.ModuleType("chembl_webresource_client.new_client")
+_new_client_module.new_client = mock.MagicMock(name="new_client")
+sys.modules["chembl_webresource_client.new_client"] = _new_client_module
+
+class FakeEmbedder:
+    """Deterministic stand-in for an embedding model; records every encode call."""
+
+    name = "fake"
+
+    def __init__(self, dim=8):
+        self.dim = dim
+        self.calls = []
+
+    def encode(self, texts, batch_size=32):
+        self.calls.append(list(texts))
+        rows = [
+            np.frombuffer(hashlib.sha256(text.encode("utf-8")).digest()[:self.dim], dtype=np.uint8)
+            for text in texts
+        ]
+        return np.asarray(rows, dtype=np.float32).reshape(len(texts), self.dim)
+
+@pytest.fixture
+def fake_embedder():
+    return FakeEmbedder()
+
+@pytest.fixture
+def weaviate_client(monkeypatch):
+    """Mocked Weaviate client returned by every weaviate.WeaviateClient() call."""
+    import weaviate
+    client = mock.MagicMock(name="WeaviateClient")
+    monkeypatch.setattr(weaviate, "WeaviateClient", mock.MagicMock(return_value=client))
+    return client
+
+@pytest.fixture
+def make_importer(monkeypatch, weaviate_client, fake_embedder):
+    """Build importers that talk to the mocked client and encode with the fake embedder."""
+    import chembl_importer
+    monkeypatch.setattr(_new_client_module, "new_client", mock.MagicMock(name="new_client"))
+    importers = []
+
+    def make(**kwargs):
+        kwargs.setdefault("requests_per_second", None)
+        importer = chembl_importer.ChEMBLWeaviateImporter(**kwargs)
+        importer.model = fake_embedder
+        importers.append(importer)
+        return importer
+
+    yield make
+    for importer in importers:
+        importer.close()
+
+def compound(chembl_id, **fields):
+    """Build a ChEMBL molecule record like those returned by the web API."""
+    record = {
+        "molecule_chembl_id": chembl_id,
+        "pref_name": f"NAME {chembl_id}",
+        "molecule_type": "Small molecule",
+        "max_phase": 2,
+        "therapeutic_flag": False,
+        "structure_type": "MOL",
+    }
+    record.update(fields)
+    return record
+
+def install_fake_worker_model():
+    """Pool initializer that gives a spawned embedding worker a FakeEmbedder."""
+    import embedders
+    embedders._worker_model = FakeEmbedder()
+
+def worker_modules():
+    """Report which of the heavy modules a worker process has imported."""
+    return sorted(m for m in ("chembl_importer", "chembl_webresource_client", "weaviate") if m in sys.modules)
@@ -0,0 +1,84 @@
+import asyncio
+import uuid
+from types import SimpleNamespace
+from unittest import mock
+
+import pytest
+import weaviate
+from weaviate.exceptions import WeaviateQueryError
+from weaviate.util import generate_uuid5
+
+from chembl_query import AsyncChEMBLQueryUtil
+
+@pytest.fixture
+def async_client(monkeypatch):
+    """Mocked async Weaviate client whose collection queries are coroutines."""
+    client = mock.MagicMock(name="WeaviateAsyncClient")
+    client.connect = mock.AsyncMock()
+    client.close = mock.AsyncMock()
+    collection = client.collections.get.return_value
+    collection.query.near_vector = mock.AsyncMock()
+    collection.query.near_object = mock.AsyncMock()
+    collection.query.fetch_objects = mock.AsyncMock()
+    collection.data.exists = mock.AsyncMock()
+    monkeypatch.setattr(weaviate, "WeaviateAsyncClient", mock.MagicMock(return_value=client))
+    return client
+
+@pytest.fixture
+def run_query(async_client, fake_embedder):
+    """Run a coroutine function against a connected AsyncChEMBLQueryUtil."""
+    def run(query):
+        async def main():
+            async with AsyncChEMBLQueryUtil() as util:
+                util.model = fake_embedder
+                return await query(util)
+        return asyncio.run(main())
+    return run
+
+def hit(chembl_id, properties):
+    return SimpleNamespace(
+        uuid=uuid.UUID(generate_uuid5(chembl_id)),
+        properties=properties,
+        metadata=SimpleNamespace(distance=0.25)
+    )
+
+def test_context_manager_connects_and_closes(run_query, async_client):
+    run_query(lambda util: asyncio.sleep(0))
+
+    async_client.connect.assert_awaited_once()
+    async_client.close.assert_awaited_once()
+
+def test_semantic_search_embeds_off_the_event_loop(run_query, async_client, fake_embedder):
+    collection = async_client.collections.get.return_value
+    collection.query.near_vector.return_value = SimpleNamespace(
+        objects=[hit("CHEMBL1", {"molecule_chembl_id": "CHEMBL1"})]
+    )
+
+    results = run_query(lambda util: util.semantic_search("cancer", limit=1))
+
+    assert results == [{"molecule_chembl_id": "CHEMBL1", "certainty": 0.75}]
+    assert fake_embedder.calls == [["cancer"]]
+    assert collection.query.near_vector.await_args.kwargs["near_vector"] == (
+        fake_embedder.encode(["cancer"])[0].tolist()
+    )
+
+def test_get_similar_compounds_excludes_the_reference(run_query, async_client):
+    collection = async_client.collections.get.return_value
+    collection.query.near_object.return_value = SimpleNamespace(objects=[
+        hit("CHEMBL1", {"pref_name": "ASPIRIN"}),
+        hit("CHEMBL2", {"pref_name": "IBUPROFEN"}),
+    ])
+
+    results = run_query(
+        lambda util: util.get_similar_compounds("CHEMBL1", limit=1, return_properties=["pref_name"])
+    )
+
+    assert results == [{"pref_name": "IBUPROFEN", "certainty": 0.75}]
+
+def test_get_similar_compounds_reports_unknown_ids(run_query, async_client):
+    collection = async_client.collections.get.return_value
+    collection.query.near_object.side_effect = WeaviateQueryError("not found", "GRPC")
+    collection.data.exists.return_value = False
+
+    with pytest.raises(ValueError, match="No compound found with ChEMBL ID: CHEMBL404"):
+        run_query(lambda util: util.get_similar_compounds("CHEMBL404"))
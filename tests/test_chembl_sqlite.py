@@ -0,0 +1,101 @@
+import os
+import sqlite3
+import subprocess
+import sys
+
+import pytest
+
+# molregno, chembl_id, pref_name, molecule_type, max_phase, therapeutic_flag, structure_type
+ROWS = [
+    (1, "CHEMBL1", "ASPIRIN", "Small molecule", 4, 1, "MOL"),
+    (2, "CHEMBL2", None, "Small molecule", 0, 0, "MOL"),
+    (3, "CHEMBL3", "INSULIN", "Protein", 3, 1, "SEQ"),
+    (4, "CHEMBL4", None, "Small molecule", None, 0, "MOL"),
+    (5, "CHEMBL5", "WITHDRAWN", "Small molecule", -1, 0, "MOL"),
+    (6, "CHEMBL6", "IBUPROFEN", "Small molecule", 4, 1, "MOL"),
+    (7, "CHEMBL7", None, "Small molecule", 0, 0, "NONE"),
+]
+
+@pytest.fixture
+def chembl_db(tmp_path):
+    """A tiny ChEMBL release holding only molecule_dictionary."""
+    path = str(tmp_path / "chembl.db")
+    conn = sqlite3.connect(path)
+    conn.execute(
+        "CREATE TABLE molecule_dictionary (molregno INTEGER PRIMARY KEY, chembl_id TEXT, "
+        "pref_name TEXT, molecule_type TEXT, max_phase NUMERIC, therapeutic_flag SMALLINT, "
+        "structure_type TEXT)"
+    )
+    conn.executemany("INSERT INTO molecule_dictionary VALUES (?, ?, ?, ?, ?, ?, ?)", ROWS)
+    conn.commit()
+    conn.close()
+    return path
+
+def chembl_ids(pages):
+    return [c["molecule_chembl_id"] for page in pages for c in page]
+
+def test_reads_compounds_like_the_web_api(make_importer, chembl_db):
+    importer = make_importer(chembl_db_path=chembl_db)
+
+    pages = list(importer.iter_chembl_sqlite(page_size=2))
+
+    # max_phase >= 0 only, highest phase first, ties in molregno order
+    assert chembl_ids(pages) == ["CHEMBL1", "CHEMBL6", "CHEMBL3", "CHEMBL2", "CHEMBL7"]
+    assert [len(page) for page in pages] == [2, 2, 1]
+    assert pages[0][0] == {
+        "molecule_chembl_id": "CHEMBL1",
+        "pref_name": "ASPIRIN",
+        "molecule_type": "Small molecule",
+        "max_phase": 4,
+        "therapeutic_flag": True,
+        "structure_type": "MOL",
+    }
+    assert pages[1][1]["therapeutic_flag"] is False
+
+@pytest.mark.parametrize("limit, offset, expected", [
+    (None, 2, ["CHEMBL3", "CHEMBL2", "CHEMBL7"]),
+    (3, 0, ["CHEMBL1", "CHEMBL6", "CHEMBL3"]),
+    (4, 1, ["CHEMBL6", "CHEMBL3", "CHEMBL2"]),
+    (10, 4, ["CHEMBL7"]),
+])
+def test_limit_and_offset_select_result_positions(make_importer, chembl_db, limit, offset, expected):
+    importer = make_importer(chembl_db_path=chembl_db)
+
+    assert chembl_ids(importer.iter_chembl_sqlite(limit, page_size=2, offset=offset)) == expected
+
+def test_only_reads_requested_fields(make_importer, chembl_db):
+    importer = make_importer(
+        chembl_db_path=chembl_db,
+        compound_fields=[("molecule_chembl_id", "TEXT", ""), ("max_phase", "NUMBER", 0)]
+    )
+
+    page = next(importer.iter_chembl_sqlite(page_size=1))
+
+    assert page == [{"molecule_chembl_id": "CHEMBL1", "max_phase": 4}]
+
+def test_import_from_sqlite_never_loads_the_web_client(make_importer, weaviate_client, chembl_db, monkeypatch):
+    # Any import of new_client now fails
+    monkeypatch.setitem(sys.modules, "chembl_webresource_client.new_client", None)
+    importer = make_importer(chembl_db_path=chembl_db)
+    collection = weaviate_client.collections.get.return_value
+    collection.batch.failed_objects = []
+    written = []
+    importer.write_batch = lambda objects, collection: written.extend(objects) or 0
+
+    importer.import_data(limit=None)
+
+    assert [o["molecule_chembl_id"] for o, _ in written] == [
+        "CHEMBL1", "CHEMBL6", "CHEMBL3", "CHEMBL2", "CHEMBL7"
+    ]
+
+def test_importing_the_importer_does_not_contact_chembl():
+    probe = (
+        "import sys, chembl_importer; "
+        "print('chembl_webresource_client.new_client' in sys.modules)"
+    )
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    output = subprocess.run(
+        [sys.executable, "-c", probe], cwd=root, check=True, capture_output=True, text=True
+    ).stdout
+
+    assert output.strip().splitlines()[-1] == "False"
@@ -0,0 +1,106 @@
+import threading
+from unittest import mock
+
+import numpy as np
+import pytest
+
+from embedders import DEFAULT_MODEL_NAME, backend_id, create_backend, get_embedder
+
+TEXTS = [
+    "This is a Small molecule named ASPIRIN with ChEMBL ID CHEMBL25. approved for clinical use",
+    "This is a Protein named INSULIN with ChEMBL ID CHEMBL1201631. in Phase III clinical trials",
+    "This is a Small molecule with ChEMBL ID CHEMBL4297186.",
+    "compounds effective against breast cancer",
+]
+
+@pytest.fixture(scope="module")
+def reference():
+    """Embeddings of TEXTS from the PyTorch backend, or skip if the model is unavailable."""
+    pytest.importorskip("sentence_transformers")
+    try:
+        backend = create_backend("sentence-transformers", DEFAULT_MODEL_NAME)
+    except Exception as e:
+        pytest.skip(f"{DEFAULT_MODEL_NAME} is not available: {e}")
+    return backend.encode(TEXTS)
+
+def load_onnx(backend):
+    pytest.importorskip("onnxruntime")
+    try:
+        return create_backend(backend, DEFAULT_MODEL_NAME)
+    except Exception as e:
+        pytest.skip(f"ONNX export of {DEFAULT_MODEL_NAME} is not available: {e}")
+
+def cosine(a, b):
+    return np.sum(a * b, axis=1) / (np.linalg.norm(a, axis=1) * np.linalg.norm(b, axis=1))
+
+def test_onnx_matches_sentence_transformers(reference):
+    embeddings = load_onnx("onnx").encode(TEXTS, batch_size=3)
+
+    assert embeddings.shape == reference.shape
+    assert embeddings.dtype == np.float32
+    np.testing.assert_allclose(embeddings, reference, atol=1e-4)
+
+def test_onnx_int8_stays_close_to_sentence_transformers(reference):
+    embeddings = load_onnx("onnx-int8").encode(TEXTS)
+
+    assert embeddings.shape == reference.shape
+    assert cosine(embeddings, reference).min() > 0.98
+
+def test_backend_id_distinguishes_backends():
+    assert backend_id("sentence-transformers") == DEFAULT_MODEL_NAME
+    assert len({backend_id(b) for b in ("sentence-transformers", "onnx", "onnx-int8")}) == 3
+
+def test_get_embedder_shares_one_instance_per_backend():
+    assert get_embedder("onnx") is get_embedder("onnx")
+    assert get_embedder("onnx") is not get_embedder("onnx-int8")
+    assert get_embedder("onnx").name == backend_id("onnx")
+
+def test_get_embedder_rejects_unknown_backend():
+    with pytest.raises(ValueError, match="Unknown embedding backend"):
+        get_embedder("tensorflow")
+
+def test_concurrent_quantization_uses_private_temp_files(tmp_path, monkeypatch):
+    quantization = pytest.importorskip("onnxruntime.quantization")
+    from embedders import OnnxBackend
+
+    model_path = tmp_path / "model.onnx"
+    model_path.write_bytes(b"fp32")
+    outputs = []
+    both_started = threading.Barrier(2, timeout=5)
+
+    def fake_quantize_dynamic(model_input, model_output, weight_type=None):
+        outputs.append(model_output)
+        # Both processes get past the existence check before either finishes
+        both_started.wait()
+        with open(model_output, "wb") as f:
+            f.write(b"int8")
+
+    monkeypatch.setattr(quantization, "quantize_dynamic", fake_quantize_dynamic)
+    threads = [
+        threading.Thread(target=OnnxBackend._quantized_model, args=(str(model_path),))
+        for _ in range(2)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len(set(outputs)) == 2
+    assert sorted(p.name for p in tmp_path.iterdir()) == ["model.onnx", "model_dynamic_qint8.onnx"]
+    assert (tmp_path / "model_dynamic_qint8.onnx").read_bytes() == b"int8"
+
+def test_worker_pool_prepares_model_files_before_spawning(make_importer, monkeypatch):
+    import chembl_importer
+    events = []
+    monkeypatch.setattr(
+        chembl_importer, "prepare_backend", lambda backend, model: events.append(("prepare", backend))
+    )
+    context = mock.MagicMock()
+    context.Pool.side_effect = lambda **kwargs: events.append(("pool", kwargs["processes"]))
+    monkeypatch.setattr(chembl_importer.multiprocessing, "get_context", lambda method: context)
+    importer = make_importer(embed_workers=3, embedding_backend="onnx-int8")
+
+    importer._get_pool()
+    importer._pool = None
+
+    assert events == [("prepare", "onnx-int8"), ("pool", 3)]
@@ -0,0 +1,59 @@
+import numpy as np
+import pytest
+
+from embedding_cache import EmbeddingCache
+
+@pytest.fixture
+def path(tmp_path):
+    return str(tmp_path / "embeddings.sqlite")
+
+def test_get_many_returns_none_for_misses(path):
+    cache = EmbeddingCache(path, "model-a")
+    cache.put_many(["aspirin"], [np.array([1.0, 2.0])])
+
+    found = cache.get_many(["ibuprofen", "aspirin"])
+
+    assert found[0] is None
+    assert found[1].dtype == np.float32
+    np.testing.assert_array_equal(found[1], [1.0, 2.0])
+    cache.close()
+
+def test_vectors_persist_across_connections(path):
+    cache = EmbeddingCache(path, "model-a")
+    cache.put_many(["aspirin", "ibuprofen"], np.eye(2, dtype=np.float32))
+    cache.close()
+
+    reopened = EmbeddingCache(path, "model-a")
+    found = reopened.get_many(["ibuprofen", "aspirin"])
+
+    np.testing.assert_array_equal(np.vstack(found), [[0, 1], [1, 0]])
+    reopened.close()
+
+def test_vectors_are_keyed_by_model(path):
+    cache = EmbeddingCache(path, "model-a")
+    cache.put_many(["aspirin"], [np.ones(2)])
+    other = EmbeddingCache(path, "model-b")
+
+    assert other.get_many(["aspirin"]) == [None]
+    cache.close()
+    other.close()
+
+def test_lookups_larger_than_the_parameter_chunk(path):
+    cache = EmbeddingCache(path, "model-a")
+    texts = [f"compound {i}" for i in range(1200)]
+    cache.put_many(texts, np.arange(1200, dtype=np.float32)[:, None])
+
+    found = cache.get_many(texts)
+
+    assert [int(v[0]) for v in found] == list(range(1200))
+    cache.close()
+
+def test_encode_only_embeds_cache_misses(make_importer, fake_embedder, path):
+    importer = make_importer(cache_path=path)
+    importer.encode(["aspirin", "ibuprofen"])
+    fake_embedder.calls.clear()
+
+    embeddings = importer.encode(["ibuprofen", "paracetamol", "aspirin"])
+
+    assert fake_embedder.calls == [["paracetamol"]]
+    np.testing.assert_array_equal(embeddings, fake_embedder.encode(["ibuprofen", "paracetamol", "aspirin"]))
@@ -0,0 +1,94 @@
+import multiprocessing
+import threading
+from unittest import mock
+
+import numpy as np
+import pytest
+
+import embedders
+from conftest import FakeEmbedder, compound, install_fake_worker_model, worker_modules
+
+class FakeAsyncResult:
+    def __init__(self, pool, value):
+        self.pool = pool
+        self.value = value
+
+    def get(self):
+        # Give the embedding stage a chance to queue later batches first
+        self.pool.ready_at_get.append(self.pool.submitted_enough.wait(timeout=2))
+        return self.value
+
+class FakePool:
+    """In-process stand-in for a worker pool that records the chunks it is given."""
+
+    def __init__(self, submissions_before_results=1):
+        self.chunks = []
+        self.submissions = 0
+        self.submissions_before_results = submissions_before_results
+        self.submitted_enough = threading.Event()
+        self.ready_at_get = []
+
+    def map_async(self, func, iterable, chunksize=1):
+        chunks = list(iterable)
+        self.chunks.append([len(texts) for texts, _ in chunks])
+        self.submissions += 1
+        if self.submissions >= self.submissions_before_results:
+            self.submitted_enough.set()
+        return FakeAsyncResult(self, [func(chunk) for chunk in chunks])
+
+    def close(self):
+        pass
+
+    def join(self):
+        pass
+
+@pytest.fixture
+def worker_model(monkeypatch):
+    model = FakeEmbedder()
+    monkeypatch.setattr(embedders, "_worker_model", model)
+    return model
+
+def test_pool_tasks_hold_encode_batch_size_descriptions(make_importer, worker_model):
+    importer = make_importer(embed_workers=4, encode_batch_size=3)
+    importer._pool = FakePool()
+    texts = [f"compound {i}" for i in range(8)]
+
+    embeddings = importer.encode(texts)
+
+    assert importer._pool.chunks == [[3, 3, 2]]
+    np.testing.assert_array_equal(embeddings, FakeEmbedder().encode(texts))
+
+def test_pool_only_encodes_cache_misses(make_importer, worker_model, tmp_path):
+    importer = make_importer(embed_workers=2, encode_batch_size=4, cache_path=str(tmp_path / "cache"))
+    importer._pool = FakePool()
+    importer.encode(["aspirin", "ibuprofen"])
+
+    embeddings = importer.encode(["ibuprofen", "paracetamol", "aspirin"])
+
+    assert importer._pool.chunks == [[2], [1]]
+    np.testing.assert_array_equal(embeddings, FakeEmbedder().encode(["ibuprofen", "paracetamol", "aspirin"]))
+
+def test_pipeline_keeps_several_batches_encoding(make_importer, worker_model):
+    importer = make_importer(embed_workers=2, encode_batch_size=2)
+    importer._pool = FakePool(submissions_before_results=3)
+    importer.write_batch = lambda objects, collection: 0
+    pages = [[compound(f"CHEMBL{i}{j}") for j in range(3)] for i in range(5)]
+    checkpoint = importer._load_checkpoint()
+
+    importer._import_pipelined(iter(pages), None, 4, checkpoint, mock.MagicMock())
+
+    # Later batches were queued on the pool before the first one was collected
+    assert importer._pool.ready_at_get[0] is True
+    assert importer._pool.chunks == [[2, 1]] * 5
+    assert checkpoint["imported"] == 15
+
+def test_spawned_workers_encode_in_order_without_importing_the_importer():
+    texts = [f"compound {i}" for i in range(10)]
+    ctx = multiprocessing.get_context("spawn")
+    with ctx.Pool(2, initializer=install_fake_worker_model) as pool:
+        chunks = [(texts[i:i + 3], 3) for i in range(0, len(texts), 3)]
+        embeddings = np.vstack(pool.map_async(embedders.encode_chunk, chunks, chunksize=1).get(timeout=60))
+        loaded = pool.apply(worker_modules)
+
+    np.testing.assert_array_equal(embeddings, FakeEmbedder().encode(texts))
+    assert loaded == []
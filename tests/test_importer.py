@@ -0,0 +1,351 @@
+from types import SimpleNamespace
+from unittest import mock
+
+import pytest
+from weaviate.util import generate_uuid5
+
+from conftest import compound
+
+def stored_objects(*data_objects):
+    """Build a fetch_objects response holding the content hashes of data objects."""
+    return SimpleNamespace(objects=[
+        SimpleNamespace(
+            uuid=generate_uuid5(o["molecule_chembl_id"]),
+            properties={"content_hash": o["content_hash"]}
+        )
+        for o in data_objects
+    ])
+
+def test_embed_batch_builds_objects_and_embeddings(make_importer, fake_embedder):
+    importer = make_importer()
+    compounds = [compound("CHEMBL1"), compound("CHEMBL2", pref_name=None)]
+
+    objects = importer.embed_batch(compounds)
+
+    assert [o["molecule_chembl_id"] for o, _ in objects] == ["CHEMBL1", "CHEMBL2"]
+    assert objects[0][0]["description"].startswith("This is a Small molecule named NAME CHEMBL1")
+    assert all(len(o["content_hash"]) == 64 for o, _ in objects)
+    # One batched encode call for the whole batch
+    assert fake_embedder.calls == [[o["description"] for o, _ in objects]]
+
+def test_embed_batch_skips_unchanged_compounds(make_importer, fake_embedder):
+    importer = make_importer()
+    unchanged, changed = importer.embed_batch([compound("CHEMBL1"), compound("CHEMBL2")])
+    collection = mock.MagicMock()
+    collection.query.fetch_objects.return_value = stored_objects(unchanged[0])
+    fake_embedder.calls.clear()
+
+    objects = importer.embed_batch([compound("CHEMBL1"), compound("CHEMBL2")], collection)
+
+    assert [o["molecule_chembl_id"] for o, _ in objects] == ["CHEMBL2"]
+    assert fake_embedder.calls == [[changed[0]["description"]]]
+
+def test_embed_batch_without_skip_unchanged_embeds_everything(make_importer):
+    importer = make_importer(skip_unchanged=False)
+    collection = mock.MagicMock()
+
+    objects = importer.embed_batch([compound("CHEMBL1")], collection)
+
+    assert len(objects) == 1
+    collection.query.fetch_objects.assert_not_called()
+
+def test_content_hash_depends_on_embedding_backend(make_importer):
+    data_object = {"molecule_chembl_id": "CHEMBL1", "description": "x"}
+    default = make_importer()._content_hash(data_object)
+    onnx = make_importer(embedding_backend="onnx-int8")._content_hash(data_object)
+
+    assert default != onnx
+
+def test_create_schema_uses_importer_vector_index(make_importer, weaviate_client):
+    importer = make_importer(vector_index={"type": "flat", "compression": "bq"})
+
+    importer.create_schema()
+
+    kwargs = weaviate_client.collections.create.call_args.kwargs
+    assert kwargs["name"] == "ChEMBLCompound"
+    assert kwargs["vector_index_config"].vector_index_type().value == "flat"
+    properties = {p.name: p for p in kwargs["properties"]}
+    assert properties["max_phase"].indexRangeFilters is True
+    assert properties["description"].indexSearchable is False
+
+def test_create_schema_defaults_to_server_vector_index(make_importer, weaviate_client):
+    make_importer().create_schema()
+
+    assert weaviate_client.collections.create.call_args.kwargs["vector_index_config"] is None
+
+def test_import_data_creates_missing_schema(make_importer, weaviate_client):
+    importer = make_importer()
+    importer._molecule_query = lambda: []
+    weaviate_client.collections.exists.return_value = False
+
+    importer.import_data(limit=10)
+
+    weaviate_client.collections.create.assert_called_once()
+
+def test_import_data_keeps_existing_schema(make_importer, weaviate_client):
+    importer = make_importer()
+    importer._molecule_query = lambda: []
+    weaviate_client.collections.exists.return_value = True
+
+    importer.import_data(limit=10)
+
+    weaviate_client.collections.create.assert_not_called()
+
+def test_pipeline_stops_fetching_when_writer_fails(make_importer):
+    importer = make_importer()
+    importer.write_batch = mock.MagicMock(side_effect=RuntimeError("write failed"))
+    state = {"consumed": 0, "closed": False}
+
+    def pages():
+        try:
+            for i in range(200):
+                state["consumed"] += 1
+                yield [compound(f"CHEMBL{i}")]
+        finally:
+            state["closed"] = True
+
+    with pytest.raises(RuntimeError, match="write failed"):
+        importer._import_pipelined(
+            pages(), mock.MagicMock(), 2, importer._load_checkpoint(), mock.MagicMock()
+        )
+
+    assert state["consumed"] < 20
+    assert state["closed"]
+
+def test_iter_chembl_data_without_limit_fetches_everything(make_importer):
+    importer = make_importer(fetch_workers=3)
+    records = [compound(f"CHEMBL{i}") for i in range(25)]
+    importer._molecule_query = lambda: records
+
+    pages = list(importer.iter_chembl_data(limit=None, page_size=10))
+
+    assert [len(page) for page in pages] == [10, 10, 5]
+    assert [c["molecule_chembl_id"] for page in pages for c in page] == [
+        c["molecule_chembl_id"] for c in records
+    ]
+
+def test_iter_chembl_data_stops_at_limit(make_importer):
+    importer = make_importer()
+    importer._molecule_query = lambda: [compound(f"CHEMBL{i}") for i in range(25)]
+
+    pages = list(importer.iter_chembl_data(limit=15, page_size=10, offset=2))
+
+    assert [len(page) for page in pages] == [10, 3]
+    assert pages[0][0]["molecule_chembl_id"] == "CHEMBL2"
+
+def test_molecule_query_orders_by_unique_tiebreaker(make_importer):
+    importer = make_importer()
+
+    importer._molecule_query()
+
+    molecule = importer.chembl_client.molecule
+    molecule.filter.return_value.order_by.assert_called_once_with("-max_phase", "molecule_chembl_id")
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+        self.sleeps = []
+
+    def monotonic(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+@pytest.fixture
+def clock(monkeypatch):
+    import chembl_importer
+    clock = FakeClock()
+    monkeypatch.setattr(chembl_importer.time, "monotonic", clock.monotonic)
+    monkeypatch.setattr(chembl_importer.time, "sleep", clock.sleep)
+    return clock
+
+def test_token_bucket_allows_burst_then_throttles(clock):
+    from chembl_importer import TokenBucket
+    bucket = TokenBucket(rate=10)
+
+    for _ in range(10):
+        bucket.acquire()
+    assert clock.sleeps == []
+
+    bucket.acquire()
+    bucket.acquire(2)
+    assert clock.sleeps == pytest.approx([0.1, 0.2])
+
+def test_token_bucket_refills_over_time(clock):
+    from chembl_importer import TokenBucket
+    bucket = TokenBucket(rate=5, capacity=2)
+    bucket.acquire(2)
+
+    clock.now += 0.2
+    bucket.acquire()
+    assert clock.sleeps == []
+
+    # Refill is capped at capacity
+    clock.now += 10
+    bucket.acquire(3)
+    assert clock.sleeps == pytest.approx([0.2])
+
+def test_checkpoint_round_trip(make_importer, tmp_path):
+    path = str(tmp_path / "checkpoint.json")
+    importer = make_importer(checkpoint_path=path)
+    checkpoint = importer._load_checkpoint()
+    assert checkpoint["offset"] == 0
+
+    importer._commit(3, [], mock.MagicMock(), checkpoint, mock.MagicMock())
+    resumed = make_importer(checkpoint_path=path)._load_checkpoint()
+
+    assert resumed == checkpoint
+    assert resumed["offset"] == 3
+    assert resumed["skipped"] == 3
+
+def test_checkpoint_from_another_source_is_rejected(make_importer, tmp_path):
+    path = str(tmp_path / "checkpoint.json")
+    api = make_importer(checkpoint_path=path)
+    api._save_checkpoint(api._load_checkpoint())
+
+    local = make_importer(checkpoint_path=path, chembl_db_path=str(tmp_path / "chembl.db"))
+    with pytest.raises(ValueError, match="delete it"):
+        local._load_checkpoint()
+
+def test_sync_deletes_compounds_missing_from_source(make_importer, weaviate_client):
+    import uuid
+    importer = make_importer()
+    importer._molecule_query = lambda: [compound("CHEMBL1"), compound("CHEMBL2")]
+    collection = weaviate_client.collections.get.return_value
+    collection.batch.failed_objects = []
+    collection.data.delete_many.return_value = SimpleNamespace(successful=1, failed=0)
+    stale = uuid.UUID(generate_uuid5("CHEMBL3"))
+    collection.iterator.return_value = [
+        SimpleNamespace(uuid=uuid.UUID(generate_uuid5("CHEMBL1"))),
+        SimpleNamespace(uuid=stale),
+    ]
+
+    importer.import_data(limit=None, sync=True)
+
+    where = collection.data.delete_many.call_args.kwargs["where"]
+    assert where.value == [str(stale)]
+
+def test_sync_with_limit_does_not_delete(make_importer, weaviate_client):
+    importer = make_importer()
+    importer._molecule_query = lambda: [compound("CHEMBL1"), compound("CHEMBL2")]
+    collection = weaviate_client.collections.get.return_value
+    collection.batch.failed_objects = []
+
+    importer.import_data(limit=2, sync=True)
+
+    collection.data.delete_many.assert_not_called()
+
+def rejected(data_object, message):
+    """Build a batch error for an object the server rejected."""
+    return SimpleNamespace(
+        object_=SimpleNamespace(
+            properties=data_object,
+            vector=[0.0],
+            uuid=generate_uuid5(data_object["molecule_chembl_id"])
+        ),
+        message=message
+    )
+
+def test_rejected_objects_are_retried_with_backoff(make_importer, clock):
+    importer = make_importer(max_retries=3, retry_backoff=0.5)
+    objects = importer.embed_batch([compound("CHEMBL1"), compound("CHEMBL2"), compound("CHEMBL3")])
+    first, second = objects[0][0], objects[1][0]
+    collection = mock.MagicMock()
+    type(collection.batch).failed_objects = mock.PropertyMock(side_effect=[
+        [rejected(first, "timeout"), rejected(second, "timeout")],
+        [rejected(second, "still failing")],
+        [rejected(second, "still failing")],
+        [rejected(second, "gave up")],
+    ])
+    batch = collection.batch.dynamic.return_value.__enter__.return_value
+    checkpoint = importer._load_checkpoint()
+
+    importer._commit(3, objects, collection, checkpoint, mock.MagicMock())
+
+    sent = [c.kwargs["properties"]["molecule_chembl_id"] for c in batch.add_object.call_args_list]
+    assert sent == ["CHEMBL1", "CHEMBL2", "CHEMBL3", "CHEMBL1", "CHEMBL2", "CHEMBL2", "CHEMBL2"]
+    assert clock.sleeps == [0.5, 1.0, 2.0]
+    assert importer.failed_objects == [{"molecule_chembl_id": "CHEMBL2", "message": "gave up"}]
+    assert checkpoint["imported"] == 2
+    assert checkpoint["failed"] == 1
+
+def test_retry_stops_once_everything_is_written(make_importer, clock):
+    importer = make_importer(max_retries=3, retry_backoff=0.5)
+    objects = importer.embed_batch([compound("CHEMBL1")])
+    collection = mock.MagicMock()
+    type(collection.batch).failed_objects = mock.PropertyMock(side_effect=[
+        [rejected(objects[0][0], "timeout")],
+        [],
+    ])
+
+    assert importer.write_batch(objects, collection) == 0
+    assert clock.sleeps == [0.5]
+    assert importer.failed_objects == []
+
+def test_import_data_creates_searchable_description_when_configured(make_importer, weaviate_client):
+    importer = make_importer(searchable_description=True)
+    importer._molecule_query = lambda: []
+    weaviate_client.collections.exists.return_value = False
+
+    importer.import_data(limit=10)
+
+    properties = {p.name: p for p in weaviate_client.collections.create.call_args.kwargs["properties"]}
+    assert properties["description"].indexSearchable is True
+
+def test_create_schema_argument_overrides_searchable_description(make_importer, weaviate_client):
+    make_importer(searchable_description=True).create_schema(searchable_description=False)
+
+    properties = {p.name: p for p in weaviate_client.collections.create.call_args.kwargs["properties"]}
+    assert properties["description"].indexSearchable is False
+
+@pytest.fixture
+def bumps(monkeypatch):
+    import chembl_importer
+    bumps = []
+    monkeypatch.setattr(chembl_importer, "bump_version", lambda client, name: bumps.append(name))
+    return bumps
+
+def test_interrupted_import_still_bumps_the_version(make_importer, bumps):
+    importer = make_importer(batch_size=1)
+    importer._molecule_query = lambda: [compound("CHEMBL1"), compound("CHEMBL2")]
+    importer.write_batch = mock.MagicMock(side_effect=[0, RuntimeError("connection lost")])
+
+    with pytest.raises(RuntimeError, match="connection lost"):
+        importer.import_data(limit=None)
+
+    assert bumps == ["ChEMBLCompound"]
+
+def test_failed_import_that_wrote_nothing_keeps_the_version(make_importer, bumps):
+    importer = make_importer()
+    importer._molecule_query = lambda: [compound("CHEMBL1")]
+    importer.write_batch = mock.MagicMock(side_effect=RuntimeError("connection lost"))
+
+    with pytest.raises(RuntimeError):
+        importer.import_data(limit=None)
+
+    assert bumps == []
+
+def test_resumed_import_only_bumps_for_its_own_writes(make_importer, bumps, tmp_path):
+    path = str(tmp_path / "checkpoint.json")
+    importer = make_importer(checkpoint_path=path)
+    checkpoint = importer._load_checkpoint()
+    checkpoint.update(offset=1, imported=1)
+    importer._save_checkpoint(checkpoint)
+    # Everything after the checkpoint is unchanged
+    importer._molecule_query = lambda: [compound("CHEMBL1")]
+
+    importer.import_data(limit=None)
+
+    assert bumps == []
+
+def test_interrupted_sync_deletion_still_bumps_the_version(make_importer, weaviate_client, bumps):
+    importer = make_importer(skip_unchanged=False)
+    importer._molecule_query = lambda: []
+    weaviate_client.collections.get.return_value.iterator.side_effect = RuntimeError("timeout")
+
+    with pytest.raises(RuntimeError, match="timeout"):
+        importer.import_data(limit=None, sync=True)
+
+    assert bumps == ["ChEMBLCompound"]
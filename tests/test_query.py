@@ -0,0 +1,339 @@
+import uuid
+from types import SimpleNamespace
+
+import pytest
+from weaviate.exceptions import WeaviateQueryError
+from weaviate.util import generate_uuid5
+
+import chembl_query
+from chembl_query import ChEMBLQueryUtil, LRUCache
+
+@pytest.fixture
+def clock(monkeypatch):
+    now = [0.0]
+    monkeypatch.setattr(chembl_query.time, "monotonic", lambda: now[0])
+    return now
+
+@pytest.fixture
+def make_query_util(weaviate_client, fake_embedder):
+    """Build query utilities on the mocked client that encode with the fake embedder."""
+    def make(**kwargs):
+        util = ChEMBLQueryUtil(**kwargs)
+        util.model = fake_embedder
+        return util
+    return make
+
+def test_lru_cache_evicts_least_recently_used():
+    cache = LRUCache(maxsize=2)
+    cache.put("a", 1)
+    cache.put("b", 2)
+    cache.get("a")
+    cache.put("c", 3)
+
+    assert cache.get("b") is None
+    assert cache.get("a") == 1
+    assert cache.get("c") == 3
+    assert cache.info() == {"hits": 3, "misses": 1, "size": 2, "maxsize": 2}
+
+def test_lru_cache_expires_entries_after_ttl(clock):
+    cache = LRUCache(maxsize=2, ttl=10)
+    cache.put("a", 1)
+
+    clock[0] = 9.9
+    assert cache.get("a") == 1
+    clock[0] = 10.0
+    assert cache.get("a") is None
+    assert cache.info()["size"] == 0
+
+def test_lru_cache_with_zero_size_stores_nothing():
+    cache = LRUCache(maxsize=0)
+    cache.put("a", 1)
+
+    assert cache.get("a") is None
+
+def test_embed_queries_encodes_each_uncached_query_once(make_query_util, fake_embedder):
+    util = make_query_util()
+    util.embed_query("cancer")
+    fake_embedder.calls.clear()
+
+    embeddings = util.embed_queries(["cancer", "diabetes", "diabetes"])
+
+    assert fake_embedder.calls == [["diabetes"]]
+    assert len(embeddings) == 3
+    assert (embeddings[1] == embeddings[2]).all()
+
+def hits(*chembl_ids):
+    """Build a near_vector response with one hit per ChEMBL ID."""
+    return SimpleNamespace(objects=[
+        SimpleNamespace(
+            uuid=chembl_id,
+            properties={"molecule_chembl_id": chembl_id},
+            metadata=SimpleNamespace(distance=0.25)
+        )
+        for chembl_id in chembl_ids
+    ])
+
+def test_result_key_covers_every_query_argument(make_query_util, monkeypatch):
+    monkeypatch.setattr(chembl_query, "get_version", lambda client, name: "v1")
+    util = make_query_util()
+    key = util._result_key("semantic_search", "cancer", 5, {"operator": "Equal"}, ["pref_name"])
+
+    assert key == util._result_key("semantic_search", "cancer", 5, {"operator": "Equal"}, ["pref_name"])
+    assert key != util._result_key("semantic_search", "cancer", 6, {"operator": "Equal"}, ["pref_name"])
+    assert key != util._result_key("semantic_search", "cancer", 5, None, ["pref_name"])
+    assert key != util._result_key("semantic_search", "cancer", 5, {"operator": "Equal"}, None)
+    assert key != util._result_key("filter_by_phase", "cancer", 5, {"operator": "Equal"}, ["pref_name"])
+
+def test_cached_results_are_invalidated_by_a_new_version(make_query_util, monkeypatch):
+    version = ["v1"]
+    monkeypatch.setattr(chembl_query, "get_version", lambda client, name: version[0])
+    util = make_query_util(result_cache_size=8, version_check_interval=0)
+    near_vector = util.collection.query.near_vector
+    near_vector.return_value = hits("CHEMBL1")
+
+    first = util.semantic_search("cancer")
+    first[0]["pref_name"] = "modified by caller"
+    near_vector.return_value = hits("CHEMBL2")
+
+    assert util.semantic_search("cancer") == [{"molecule_chembl_id": "CHEMBL1", "certainty": 0.75}]
+    assert near_vector.call_count == 1
+
+    version[0] = "v2"
+    assert util.semantic_search("cancer") == [{"molecule_chembl_id": "CHEMBL2", "certainty": 0.75}]
+    assert near_vector.call_count == 2
+
+def test_collection_version_is_rechecked_after_interval(make_query_util, monkeypatch, clock):
+    calls = []
+    monkeypatch.setattr(chembl_query, "get_version", lambda client, name: calls.append(name) or "v1")
+    util = make_query_util(version_check_interval=5)
+
+    util.collection_version()
+    clock[0] = 4.9
+    util.collection_version()
+    assert calls == ["ChEMBLCompound"]
+
+    clock[0] = 5.0
+    util.collection_version()
+    assert len(calls) == 2
+
+def test_to_filter_converts_where_dicts():
+    from weaviate.classes.query import Filter
+    from chembl_query import to_filter
+
+    where = {"path": ["max_phase"], "operator": "GreaterThanEqual", "valueNumber": 3}
+
+    assert to_filter(where) == Filter.by_property("max_phase").greater_or_equal(3)
+    combined = to_filter({
+        "operator": "Or",
+        "operands": [where, {"path": ["pref_name"], "operator": "Like", "valueText": "ASP*"}],
+    })
+    expected = Filter.any_of([
+        Filter.by_property("max_phase").greater_or_equal(3),
+        Filter.by_property("pref_name").like("ASP*"),
+    ])
+    assert type(combined) is type(expected)
+    assert combined.filters == expected.filters
+
+def test_to_filter_passes_through_empty_and_filter_objects():
+    from weaviate.classes.query import Filter
+    from chembl_query import to_filter
+
+    existing = Filter.by_property("max_phase").equal(4)
+
+    assert to_filter(None) is None
+    assert to_filter({}) is None
+    assert to_filter(existing) is existing
+
+def test_to_filter_rejects_unknown_operator():
+    from chembl_query import to_filter
+
+    with pytest.raises(ValueError, match="Unsupported filter operator"):
+        to_filter({"path": ["max_phase"], "operator": "WithinGeoRange", "valueNumber": 1})
+
+def test_to_filter_rejects_where_without_value():
+    from chembl_query import to_filter
+
+    with pytest.raises(ValueError, match="has no value"):
+        to_filter({"path": ["max_phase"], "operator": "Equal"})
+
+def test_semantic_search_many_returns_results_in_input_order(make_query_util, fake_embedder):
+    util = make_query_util()
+    by_vector = {}
+    for query in ("cancer", "diabetes", "malaria"):
+        by_vector[tuple(fake_embedder.encode([query])[0])] = query
+    fake_embedder.calls.clear()
+    util.collection.query.near_vector.side_effect = (
+        lambda near_vector, **kwargs: hits(by_vector[tuple(near_vector)])
+    )
+
+    results = util.semantic_search_many(["malaria", "cancer", "diabetes", "cancer"], max_concurrency=3)
+
+    assert [r[0]["molecule_chembl_id"] for r in results] == ["malaria", "cancer", "diabetes", "cancer"]
+    # Duplicates are embedded once, in one batched call
+    assert fake_embedder.calls == [["malaria", "cancer", "diabetes"]]
+
+def test_semantic_search_many_mixes_cached_and_new_results(make_query_util, fake_embedder, monkeypatch):
+    monkeypatch.setattr(chembl_query, "get_version", lambda client, name: "v1")
+    util = make_query_util(result_cache_size=8)
+    near_vector = util.collection.query.near_vector
+    near_vector.return_value = hits("CHEMBL1")
+    util.semantic_search("cancer")
+    near_vector.return_value = hits("CHEMBL2")
+    fake_embedder.calls.clear()
+
+    results = util.semantic_search_many(["diabetes", "cancer"])
+
+    assert [r[0]["molecule_chembl_id"] for r in results] == ["CHEMBL2", "CHEMBL1"]
+    assert fake_embedder.calls == [["diabetes"]]
+    assert near_vector.call_count == 2
+    assert util.semantic_search("diabetes")[0]["molecule_chembl_id"] == "CHEMBL2"
+    assert near_vector.call_count == 2
+
+def similar_hits(*chembl_ids, include_id=True):
+    """Build a response with one hit per ChEMBL ID, stored under its deterministic UUID."""
+    return SimpleNamespace(objects=[
+        SimpleNamespace(
+            uuid=uuid.UUID(generate_uuid5(chembl_id)),
+            properties={"molecule_chembl_id": chembl_id} if include_id else {"pref_name": chembl_id.lower()},
+            metadata=SimpleNamespace(distance=0.5)
+        )
+        for chembl_id in chembl_ids
+    ])
+
+def test_get_similar_compounds_excludes_the_reference(make_query_util):
+    util = make_query_util()
+    near_object = util.collection.query.near_object
+    near_object.return_value = similar_hits("CHEMBL1", "CHEMBL2", "CHEMBL3", include_id=False)
+
+    results = util.get_similar_compounds("CHEMBL1", limit=2, return_properties=["pref_name"])
+
+    assert results == [{"pref_name": "chembl2", "certainty": 0.5}, {"pref_name": "chembl3", "certainty": 0.5}]
+    assert near_object.call_args.kwargs["near_object"] == generate_uuid5("CHEMBL1")
+    assert near_object.call_args.kwargs["limit"] == 3
+
+def test_get_similar_compounds_reports_unknown_ids(make_query_util):
+    util = make_query_util()
+    util.collection.query.near_object.side_effect = WeaviateQueryError("not found", "GRPC")
+    util.collection.data.exists.return_value = False
+
+    with pytest.raises(ValueError, match="No compound found with ChEMBL ID: CHEMBL404"):
+        util.get_similar_compounds("CHEMBL404")
+
+def test_get_similar_compounds_reraises_other_query_errors(make_query_util):
+    util = make_query_util()
+    util.collection.query.near_object.side_effect = WeaviateQueryError("timeout", "GRPC")
+    util.collection.data.exists.return_value = True
+
+    with pytest.raises(WeaviateQueryError):
+        util.get_similar_compounds("CHEMBL1")
+
+def test_get_similar_compounds_many(make_query_util):
+    util = make_query_util()
+    known = ["CHEMBL1", "CHEMBL2", "CHEMBL3", "CHEMBL4"]
+
+    def fetch_objects(filters, **kwargs):
+        # Stored vector [n] for CHEMBLn; unknown IDs are simply missing
+        requested = {str(u) for u in filters.value}
+        return SimpleNamespace(objects=[
+            SimpleNamespace(uuid=uuid.UUID(generate_uuid5(c)), vector={"default": [float(c[-1])]})
+            for c in known if generate_uuid5(c) in requested
+        ])
+
+    def near_vector(near_vector, **kwargs):
+        # Nearest hit is always the reference itself
+        reference = f"CHEMBL{int(near_vector[0])}"
+        return similar_hits(reference, f"{reference}-a", f"{reference}-b")
+
+    util.collection.query.fetch_objects.side_effect = fetch_objects
+    util.collection.query.near_vector.side_effect = near_vector
+
+    results = list(util.get_similar_compounds_many(
+        ["CHEMBL3", "CHEMBL404", "CHEMBL1", "CHEMBL4", "CHEMBL2"], limit=1, chunk_size=2, max_concurrency=4
+    ))
+
+    assert results == [
+        ("CHEMBL3", [{"molecule_chembl_id": "CHEMBL3-a", "certainty": 0.5}]),
+        ("CHEMBL404", None),
+        ("CHEMBL1", [{"molecule_chembl_id": "CHEMBL1-a", "certainty": 0.5}]),
+        ("CHEMBL4", [{"molecule_chembl_id": "CHEMBL4-a", "certainty": 0.5}]),
+        ("CHEMBL2", [{"molecule_chembl_id": "CHEMBL2-a", "certainty": 0.5}]),
+    ]
+    # One reference-vector request per chunk, each for that chunk's IDs only
+    requests = util.collection.query.fetch_objects.call_args_list
+    assert [len(c.kwargs["filters"].value) for c in requests] == [2, 2, 1]
+    assert all(c.kwargs["include_vector"] for c in requests)
+    assert util.collection.query.near_vector.call_count == 4
+
+class FakePhaseIndex:
+    """fetch_objects stand-in that serves compounds sorted by molecule_chembl_id."""
+
+    def __init__(self, count):
+        self.records = [
+            {"molecule_chembl_id": f"CHEMBL{i}", "pref_name": f"name {i}", "max_phase": 4}
+            for i in range(1, count + 1)
+        ]
+        self.afters = []
+        self.requests = []
+
+    def __call__(self, filters, sort, limit, return_properties):
+        self.requests.append({"filters": filters, "return_properties": return_properties})
+        after = None
+        if hasattr(filters, "filters"):
+            phase_filter, cursor = filters.filters
+            assert phase_filter.target == "max_phase"
+            assert (cursor.target, cursor.operator.value) == ("molecule_chembl_id", "GreaterThan")
+            after = cursor.value
+        self.afters.append(after)
+        page = [r for r in self.records if after is None or r["molecule_chembl_id"] > after][:limit]
+        if return_properties is not None:
+            page = [{k: r[k] for k in return_properties} for r in page]
+        return SimpleNamespace(objects=[SimpleNamespace(properties=p) for p in page])
+
+def test_iter_by_phase_pages_with_a_keyset_cursor(make_query_util):
+    util = make_query_util()
+    index = FakePhaseIndex(5)
+    util.collection.query.fetch_objects.side_effect = index
+
+    ids = [c["molecule_chembl_id"] for c in util.iter_by_phase(min_phase=3, page_size=2)]
+
+    assert ids == ["CHEMBL1", "CHEMBL2", "CHEMBL3", "CHEMBL4", "CHEMBL5"]
+    # The short third page ends iteration without another request
+    assert index.afters == [None, "CHEMBL2", "CHEMBL4"]
+    assert index.requests[0]["filters"].value == 3
+
+def test_iter_by_phase_stops_on_an_empty_page(make_query_util):
+    util = make_query_util()
+    index = FakePhaseIndex(4)
+    util.collection.query.fetch_objects.side_effect = index
+
+    assert len(list(util.iter_by_phase(page_size=2))) == 4
+    assert index.afters == [None, "CHEMBL2", "CHEMBL4"]
+
+def test_iter_by_phase_resumes_after_an_id(make_query_util):
+    util = make_query_util()
+    index = FakePhaseIndex(5)
+    util.collection.query.fetch_objects.side_effect = index
+
+    ids = [c["molecule_chembl_id"] for c in util.iter_by_phase(page_size=10, after="CHEMBL3")]
+
+    assert ids == ["CHEMBL4", "CHEMBL5"]
+    assert index.afters == ["CHEMBL3"]
+
+def test_iter_by_phase_strips_the_cursor_property(make_query_util):
+    util = make_query_util()
+    index = FakePhaseIndex(3)
+    util.collection.query.fetch_objects.side_effect = index
+
+    names = list(util.iter_by_phase(page_size=2, return_properties=["pref_name"]))
+
+    assert names == [{"pref_name": "name 1"}, {"pref_name": "name 2"}, {"pref_name": "name 3"}]
+    assert index.requests[0]["return_properties"] == ["pref_name", "molecule_chembl_id"]
+    assert index.afters == [None, "CHEMBL2"]
+
+def test_iter_by_phase_keeps_a_requested_id(make_query_util):
+    util = make_query_util()
+    util.collection.query.fetch_objects.side_effect = FakePhaseIndex(1)
+
+    results = list(util.iter_by_phase(return_properties=["molecule_chembl_id"]))
+
+    assert results == [{"molecule_chembl_id": "CHEMBL1"}]